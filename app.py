@@ -3,13 +3,21 @@
 B(기반 정보) → A(정량 데이터) → C(자동 분석) → 생성
 """
 
+import copy
 import os
+import tempfile
 from datetime import date
+
+# matplotlib 폰트 캐시 위치 고정 (chart_generator가 matplotlib을 처음 불러오기 전에 설정)
+os.environ.setdefault("MPLCONFIGDIR", os.path.join(tempfile.gettempdir(), "mplcache-exhibition"))
+os.makedirs(os.environ["MPLCONFIGDIR"], exist_ok=True)
+
 import streamlit as st
 import pandas as pd
 
 from tabs import tab_base, tab_data, tab_analysis, tab_generate
 import reference_data as rd
+from utils import SESSION_DEFAULTS
 
 # ──────────────────────────────────────────────
 # 페이지 설정
@@ -26,7 +34,8 @@ st.set_page_config(
 # CSS
 # ──────────────────────────────────────────────
 
-st.markdown("""
+# 공백을 접어 한 줄로 — 매 rerun마다 WebSocket으로 보내는 바이트를 줄임
+_CSS = " ".join("""
 <style>
     .section-header {
         font-size: 1.3rem;
@@ -64,142 +73,57 @@ st.markdown("""
     }
     .stNumberInput > div > div > input { text-align: right; }
 </style>
-""", unsafe_allow_html=True)
+""".split())
+
+# Streamlit은 이번 실행에서 다시 그리지 않은 요소를 화면에서 지우므로 세션당 1회가 아니라 매 실행 주입
+st.markdown(_CSS, unsafe_allow_html=True)
 
 
 # ──────────────────────────────────────────────
 # 세션 초기화
 # ──────────────────────────────────────────────
 
+# 기본값은 없지만 탭을 오가도 유지해야 하는 위젯 키
+# (파일 업로더는 session_state로 값을 되살릴 수 없으므로 전시실 항목에 저장한 경로로 유지)
+_PERSIST_WIDGET_KEYS = {"type_select", "anthropic_api_key"}
+
+
 def init_session():
     """세션 상태 기본값 설정"""
-    defaults = {
-        # ── B: 기반 정보 ──
-        "exhibition_title": "",
-        "period_start": None,
-        "period_end": None,
-        "artists": "",
-        "chief_curator": "",
-        "curators": "",
-        "coordinators": "",
-        "curatorial_team": "",
-        "pr_person": "",
-        "sponsors": "",
-        "theme_text": "",
-        "rooms": [{"name": "1전시실", "artists": ""}],
-        "related_programs": [{"category": None, "title": "", "date": None, "participants": "", "note": ""}],
-        "printed_materials": [{"type": None, "quantity": "", "note": ""}],
-        # 홍보 방식 (B — 서술)
-        "promo_advertising": "",
-        "promo_press_release": "",
-        "promo_web_invitation": "",
-        "promo_newsletter": "",
-        "promo_sns": "",
-        "promo_other": "",
-        # 언론보도 리스트 (B — 서술)
-        "press_print": [{"outlet": "", "date": None, "title": "", "note": ""}],
-        "press_online": [{"outlet": "", "date": None, "title": "", "url": ""}],
-        "membership_text": "",
-        # 관객 후기 (B — 정성)
-        "visitor_reviews": [{"category": "긍정", "content": "", "source": ""}],
-
-        # ── A: 정량 데이터 ──
-        "total_budget": 0,
-        "budget_exhibition": 0,
-        "budget_supplementary": 0,
-        "budget_planned": 0,
-        "total_revenue": 0,
-        "ticket_revenue": 0,
-        "other_revenue": 0,
-        "total_visitors": 0,
-        "visitor_general": 0,
-        "visitor_student": 0,
-        "visitor_invitation": 0,
-        "visitor_artpass": 0,
-        "visitor_discover": 0,
-        "visitor_discount": 0,
-        "visitor_group": 0,
-        "opening_attendance": 0,
-        "artwork_total": 0,
-        "artwork_painting": 0,
-        "artwork_sculpture": 0,
-        "artwork_photo": 0,
-        "artwork_installation": 0,
-        "artwork_media": 0,
-        "artwork_other": 0,
-        "program_count": 0,
-        "program_sessions": 0,
-        "program_participants": 0,
-        "docent_total": 0,
-        "docent_regular": 0,
-        "docent_special": 0,
-        "staff_total": 0,
-        "staff_paid": 0,
-        "staff_volunteer": 0,
-        "press_count": 0,
-        "sns_posts": 0,
-        "sns_feedback": 0,
-        "web_invitation_count": 0,
-        "newsletter_open_rate": 0.0,
-        "membership_count": 0,
-
-        # ── 분석 설정 ──
-        "exhibition_type": None,
-
-        # ── C: 분석 결과 ──
-        "analysis_result": None,
-        "insight_selections": {},
-        "insight_texts": {},
-        "eval_positive_drafts": [],
-        "eval_negative_drafts": [],
-        "eval_improvement_drafts": [],
-        # 사용자 추가 평가
-        "eval_positive_custom": [""],
-        "eval_negative_custom": [""],
-        "eval_improvement_custom": [""],
-
-        # ── 예산 상세 (보고서용) ──
-        "budget_summary": [{"category": "", "planned": "", "actual": "", "note": ""}],
-        "budget_details": [{"category": "", "subcategory": "", "detail": "", "amount": "", "note": ""}],
-        "budget_breakdown_notes": [""],
-        "budget_arrow_notes": [""],
-        # 관객 분석 텍스트
-        "visitor_ticket_analysis": [""],
-        "visitor_analysis_text": "",
-        "weekly_visitors": {},
-    }
-
-    for key, val in defaults.items():
-        if key not in st.session_state:
-            st.session_state[key] = val
+    # 없는 키만 한 번에 채움 (매 rerun마다 실행되는 경로)
+    # 기본값의 리스트·딕셔너리를 세션끼리 공유하지 않도록 복사해서 넣음
+    missing = SESSION_DEFAULTS.keys() - st.session_state.keys()
+    if missing:
+        st.session_state.update({key: copy.deepcopy(SESSION_DEFAULTS[key]) for key in missing})
 
     # ── pending JSON 적용 (위젯 렌더링 전에 실행) ──
     if "_pending_json" in st.session_state:
         data = st.session_state.pop("_pending_json")
 
-        # 중첩 리스트 안의 날짜 문자열 → date 객체 변환
-        for list_key in ("related_programs", "press_print", "press_online"):
-            if list_key in data and isinstance(data[list_key], list):
-                for item in data[list_key]:
-                    if isinstance(item, dict) and "date" in item:
-                        d = item["date"]
-                        if isinstance(d, str) and d:
-                            try:
-                                item["date"] = date.fromisoformat(d)
-                            except ValueError:
-                                item["date"] = None
-                        elif not isinstance(d, date):
-                            item["date"] = None
-
-        date_keys = {"period_start", "period_end"}
-        for key, val in data.items():
-            # 위젯 키 소유권 해제 후 새 값 설정
-            if key in st.session_state:
-                del st.session_state[key]
-            if key in date_keys:
-                st.session_state[key] = date.fromisoformat(val) if val else None
-            else:
-                st.session_state[key] = val
+        # 목록 항목 정규화 (날짜 문자열 → date 객체 등) — 렌더링 때는 다시 검사하지 않음
+        for list_key in tab_base.LIST_TABLE_COLUMNS:
+            items = data.get(list_key)
+            if isinstance(items, list):
+                data[list_key] = tab_base.normalize_list_items(list_key, items)
+
+        for key in ("period_start", "period_end"):
+            if key in data:
+                data[key] = date.fromisoformat(data[key]) if data[key] else None
+
+        # 위젯 키 소유권 해제 후 새 값 일괄 설정
+        # (목록·개수 편집 위젯 키는 새 값으로 다시 채워지도록 모두 비움)
+        for key in data.keys() & st.session_state.keys():
+            del st.session_state[key]
+        for key in [k for k in st.session_state
+                    if k.startswith(tab_base.LIST_WIDGET_PREFIXES) or k in tab_data.COUNT_TABLES]:
+            del st.session_state[key]
+        st.session_state.update(data)
+
+    # 선택한 탭만 렌더링하므로, 이번 실행에서 그려지지 않는 위젯의 값이 실행 끝에
+    # 정리되지 않도록 입력 키를 매 실행마다 일반 세션 값으로 다시 등록
+    s = st.session_state
+    for key in SESSION_DEFAULTS.keys() | (_PERSIST_WIDGET_KEYS & s.keys()):
+        s[key] = s[key]
 
 
 init_session()
@@ -209,14 +133,18 @@ init_session()
 # 레퍼런스 데이터 로드
 # ──────────────────────────────────────────────
 
-@st.cache_data
+@st.cache_resource
 def load_reference_data():
-    """레퍼런스 Excel 로드 (캐싱)"""
+    """레퍼런스 Excel 로드 (캐싱)
+
+    읽기 전용으로 모든 세션이 같은 DataFrame을 공유 (cache_data처럼 세션마다
+    복사본을 만들지 않으므로 분석 엔진의 레퍼런스 전처리 캐시도 계속 적중)
+    """
     xlsx_path = os.path.join(os.path.dirname(__file__), "exhibition_reference_data.xlsx")
     if not os.path.exists(xlsx_path):
         return None
     try:
-        return rd.load_reference(xlsx_path)
+        return rd.load_reference_cached(xlsx_path)
     except Exception as e:
         st.error(f"레퍼런스 로드 오류: {e}")
         return None
@@ -245,14 +173,14 @@ with st.sidebar:
 # 탭 구조: B → A → C → 생성
 # ──────────────────────────────────────────────
 
-tab_b, tab_a, tab_c, tab_d = st.tabs([
-    "📋 기본 정보",
-    "📊 정량 데이터",
-    "🔍 분석 & 평가",
-    "📄 보고서 생성",
-])
-
-tab_base.render(tab_b)
-tab_data.render(tab_a)
-tab_analysis.render(tab_c, load_reference_data)
-tab_generate.render(tab_d, load_reference_data)
+# st.tabs는 보이지 않는 탭까지 매번 모두 렌더링하므로, 선택한 탭 하나만 렌더링
+TABS = {
+    "📋 기본 정보": lambda container: tab_base.render(container),
+    "📊 정량 데이터": lambda container: tab_data.render(container),
+    "🔍 분석 & 평가": lambda container: tab_analysis.render(container, load_reference_data),
+    "📄 보고서 생성": lambda container: tab_generate.render(container, load_reference_data),
+}
+
+active_tab = st.radio("탭", list(TABS), horizontal=True, key="active_tab",
+                      label_visibility="collapsed")
+TABS[active_tab](st.container())
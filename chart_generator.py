@@ -6,200 +6,460 @@
 - 예산 계획 대비 집행 비교 차트
 """
 
-import matplotlib
-matplotlib.use('Agg')  # GUI 없이 사용
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
+import hashlib
+import json
 import os
 import tempfile
 
+# matplotlib 설정/폰트 캐시 디렉터리 고정 — 기본 위치에 쓸 수 없는 환경에서
+# import할 때마다 폰트 캐시를 다시 만드는 것을 방지 (matplotlib import 전에 설정)
+os.environ.setdefault("MPLCONFIGDIR", os.path.join(tempfile.gettempdir(), "mplcache-exhibition"))
+os.makedirs(os.environ["MPLCONFIGDIR"], exist_ok=True)
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+import io
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+
+@lru_cache(maxsize=1)
+def _mpl():
+    """matplotlib 지연 import — 앱 첫 화면 로딩에 import 비용이 들지 않도록
+    matplotlib이 실제로 필요한 차트를 처음 그릴 때 1회만 불러옴"""
+    import matplotlib
+    matplotlib.use('Agg')  # GUI 없이 사용
+    import matplotlib.pyplot as plt
+    import matplotlib.font_manager as fm
+    return plt, fm
+
+
 # ──────────────────────────────────────────────
 # 한글 폰트 설정
 # ──────────────────────────────────────────────
 
-def setup_korean_font():
-    """한글 폰트 설정 - Noto Sans CJK 우선, 환경에 따라 자동 탐색"""
-    font_candidates = [
-        # Noto Sans CJK (우선)
-        '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',
-        '/usr/share/fonts/opentype/noto/NotoSansCJKkr-Regular.otf',
-        '/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc',
-        '/usr/share/fonts/truetype/noto/NotoSansCJKkr-Regular.otf',
-        '/usr/share/fonts/noto-cjk/NotoSansCJKkr-Regular.otf',
-        # macOS
-        '/System/Library/Fonts/Supplemental/NotoSansCJKkr-Regular.otf',
-        '/Library/Fonts/NotoSansCJKkr-Regular.otf',
-        # Windows
-        'C:/Windows/Fonts/NotoSansCJKkr-Regular.otf',
-        # Fallback: Nanum Gothic
-        '/usr/share/fonts/truetype/nanum/NanumGothic.ttf',
-        '/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf',
-        # Fallback: 맑은 고딕 (Windows)
-        'C:/Windows/Fonts/malgun.ttf',
-        # Fallback: Apple Gothic
-        '/System/Library/Fonts/AppleGothic.ttf',
-    ]
-
-    for font_path in font_candidates:
-        if os.path.exists(font_path):
-            return fm.FontProperties(fname=font_path)
-
-    # matplotlib font_manager에서 Noto Sans CJK 탐색
-    for font in fm.fontManager.ttflist:
-        if 'Noto Sans CJK' in font.name or 'NotoSansCJK' in font.name:
-            return fm.FontProperties(fname=font.fname)
-
-    # 폰트를 찾지 못한 경우 기본 설정
-    plt.rcParams['font.family'] = 'DejaVu Sans'
+FONT_CANDIDATES = [
+    # Noto Sans CJK (우선)
+    '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',
+    '/usr/share/fonts/opentype/noto/NotoSansCJKkr-Regular.otf',
+    '/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc',
+    '/usr/share/fonts/truetype/noto/NotoSansCJKkr-Regular.otf',
+    '/usr/share/fonts/noto-cjk/NotoSansCJKkr-Regular.otf',
+    # macOS
+    '/System/Library/Fonts/Supplemental/NotoSansCJKkr-Regular.otf',
+    '/Library/Fonts/NotoSansCJKkr-Regular.otf',
+    # Windows
+    'C:/Windows/Fonts/NotoSansCJKkr-Regular.otf',
+    # Fallback: Nanum Gothic
+    '/usr/share/fonts/truetype/nanum/NanumGothic.ttf',
+    '/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf',
+    # Fallback: 맑은 고딕 (Windows)
+    'C:/Windows/Fonts/malgun.ttf',
+    # Fallback: Apple Gothic
+    '/System/Library/Fonts/AppleGothic.ttf',
+]
+
+def _find_font_file(candidates):
+    """후보 중 처음으로 존재하는 파일 경로 — 경로마다 stat하는 대신 디렉터리당 scandir 1회"""
+    listings = {}
+    for path in candidates:
+        folder, name = os.path.split(path)
+        if folder not in listings:
+            try:
+                with os.scandir(folder) as entries:
+                    listings[folder] = {entry.name for entry in entries}
+            except OSError:
+                listings[folder] = frozenset()
+        if name in listings[folder]:
+            return path
     return None
 
 
+# 알려진 경로의 한글 폰트 파일 (파일 존재 여부만 확인하므로 matplotlib 불필요)
+KOREAN_FONT_PATH = _find_font_file(FONT_CANDIDATES)
+
+
+@lru_cache(maxsize=1)
+def setup_korean_font():
+    """한글 폰트 설정 - Noto Sans CJK 우선, 환경에 따라 자동 탐색 (프로세스당 1회)
+
+    찾은 폰트를 matplotlib에 등록하고 rcParams 기본 글꼴로 지정하므로
+    차트 함수는 텍스트마다 fontproperties를 넘기지 않아도 됨.
+
+    Returns:
+        등록한 폰트 파일 경로 (찾지 못하면 None)
+    """
+    plt, fm = _mpl()
+
+    font_path = KOREAN_FONT_PATH
+    if font_path is None:
+        # matplotlib font_manager에서 Noto Sans CJK 탐색
+        font_path = next((font.fname for font in fm.fontManager.ttflist
+                          if 'Noto Sans CJK' in font.name or 'NotoSansCJK' in font.name), None)
+
+    if font_path is None:
+        # 폰트를 찾지 못한 경우 기본 설정
+        plt.rcParams['font.family'] = 'DejaVu Sans'
+        return None
+
+    fm.fontManager.addfont(font_path)
+    plt.rcParams['font.family'] = fm.FontProperties(fname=font_path).get_name()
+    plt.rcParams['axes.unicode_minus'] = False
+    return font_path
+
+
+@lru_cache(maxsize=1)
+def korean_font_file():
+    """한글 폰트 파일 경로 — 알려진 경로에 없을 때만 matplotlib 폰트 목록까지 탐색"""
+    return KOREAN_FONT_PATH or setup_korean_font()
+
+
 def get_font_prop():
-    """폰트 속성 반환"""
-    prop = setup_korean_font()
-    return prop
+    """폰트 속성 반환 (하위 호환 — 차트는 rcParams 기본 글꼴을 사용)"""
+    font_path = setup_korean_font()
+    if font_path is None:
+        return None
+    _, fm = _mpl()
+    return fm.FontProperties(fname=font_path)
+
+
+# ──────────────────────────────────────────────
+# 렌더링 공통
+# ──────────────────────────────────────────────
+
+# figsize별로 재사용하는 Figure (pyplot 전역 상태는 _FIG_LOCK으로 보호)
+_FIG_CACHE = {}
+_FIG_LOCK = threading.Lock()
+
+
+def _get_figure(figsize):
+    """figsize에 맞는 Figure를 비우고 새 Axes와 함께 반환 (닫지 않고 재사용)"""
+    fig = _FIG_CACHE.get(figsize)
+    if fig is None:
+        plt, _ = _mpl()
+        fig = _FIG_CACHE[figsize] = plt.figure(figsize=figsize, dpi=200, facecolor='white')
+    fig.clf()
+    return fig, fig.add_subplot(111)
+
+
+def _to_png(fig):
+    """Figure를 PNG 바이트로 저장 — Agg 버퍼를 그대로 Pillow로 인코딩
+    (bbox_inches='tight' 재렌더링 대신 이미 그린 버퍼에서 내용 영역 + 0.1인치만 잘라냄)"""
+    fig.canvas.draw()
+    img = Image.fromarray(np.asarray(fig.canvas.buffer_rgba())).convert('RGB')
+    x0, y0, x1, y1 = (v * fig.dpi for v in fig.get_tightbbox().padded(0.1).extents)
+    w, h = img.size
+    img = img.crop((max(0, math.floor(x0)), max(0, math.floor(h - y1)),
+                    min(w, math.ceil(x1)), min(h, math.ceil(h - y0))))
+    return _encode_png(img)
+
+
+def _encode_png(img):
+    buf = io.BytesIO()
+    img.save(buf, 'PNG', optimize=False, compress_level=1)
+    return buf.getvalue()
+
+
+def _write_png(output_path, png_bytes):
+    # 임시 파일에 쓴 뒤 교체 — 같은 경로를 동시에 읽는 다른 세션이 반쯤 쓴 파일을 보지 않도록
+    tmp_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(png_bytes)
+    os.replace(tmp_path, output_path)
+
+
+def _split(data):
+    """dict 또는 미리 나눈 (labels, values) → (라벨 튜플, 값 배열)"""
+    if isinstance(data, dict):
+        return tuple(data), np.array(tuple(data.values()))
+    labels, values = data
+    return tuple(labels), np.asarray(values)
+
+
+def _chart_path(*key):
+    """차트 종류 + 입력값 해시로 정한 임시 PNG 경로 (같은 입력이면 같은 파일)"""
+    digest = hashlib.blake2b(json.dumps(key, ensure_ascii=False, default=_json_default).encode(),
+                             digest_size=16).hexdigest()
+    return os.path.join(tempfile.gettempdir(), f"chart-{digest}.png")
+
+
+def _json_default(obj):
+    return obj.tolist() if isinstance(obj, np.ndarray) else str(obj)
+
+
+def _finalize(kind, render, args, output_path=None, return_bytes=False):
+    """create_* 공통 마무리 — render(*args)의 PNG 바이트를 반환하거나 파일로 저장
+
+    output_path가 없으면 입력값 해시 경로를 쓰고, 그 파일이 이미 있으면 렌더링을 건너뜀.
+    """
+    if return_bytes:
+        return render(*args)
+    if output_path is None:
+        output_path = _chart_path(kind, *args)
+        if os.path.exists(output_path):
+            return output_path
+    _write_png(output_path, render(*args))
+    return output_path
+
+
+def _draw_locked(draw, *args):
+    """pyplot 전역 상태를 쓰는 draw(*args)를 _FIG_LOCK 안에서 실행"""
+    with _FIG_LOCK:
+        return draw(*args)
+
+
+def chart_thread_pool(max_workers=2) -> ThreadPoolExecutor:
+    """보고서 문서 작성과 겹쳐 차트를 미리 렌더링할 스레드 풀
+
+    워커 스레드는 만든 쪽의 Streamlit 실행 컨텍스트를 물려받아
+    st.cache_data 차트 캐시를 경고 없이 그대로 사용
+    """
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is None:
+        return ThreadPoolExecutor(max_workers=max_workers)
+    return ThreadPoolExecutor(max_workers=max_workers,
+                              initializer=add_script_run_ctx, initargs=(None, ctx))
+
+
+# ──────────────────────────────────────────────
+# Pillow 직접 렌더링 (파이/주별 막대처럼 단순한 차트용)
+# ──────────────────────────────────────────────
+
+_DPI = 200
+
+CHART_COLORS = ['#4472C4', '#ED7D31', '#A5A5A5', '#FFC000', '#5B9BD5',
+                '#70AD47', '#264478', '#9B59B6']
+
+
+def _pt(size):
+    """포인트 → 픽셀 (matplotlib 차트와 같은 200dpi 기준)"""
+    return round(size * _DPI / 72)
+
+
+@lru_cache(maxsize=None)
+def _pil_font(size):
+    """포인트 크기별 Pillow 폰트 — 한글 폰트가 없으면 Pillow 기본 폰트"""
+    font_file = korean_font_file()
+    if font_file:
+        try:
+            return ImageFont.truetype(font_file, _pt(size))
+        except OSError:
+            pass
+    return ImageFont.load_default(size=_pt(size))
+
+
+def _text_size(draw, text, font):
+    left, top, right, bottom = draw.multiline_textbbox((0, 0), text, font=font)
+    return right - left, bottom - top
+
+
+def _nice_step(raw):
+    """raw 이상인 1·2·2.5·5 × 10^n 꼴의 눈금 간격"""
+    exp = 10 ** math.floor(math.log10(raw))
+    for m in (1, 2, 2.5, 5, 10):
+        if m * exp >= raw:
+            return m * exp
 
 
 # ──────────────────────────────────────────────
 # 파이차트: 관객 구성 (입장권별)
 # ──────────────────────────────────────────────
 
-def create_visitor_pie_chart(data, title="관객 구성", output_path=None):
+def create_visitor_pie_chart(data, title="관객 구성", output_path=None, return_bytes=False):
     """관객 구성 파이차트 생성
 
     Args:
-        data: dict, {"카테고리": 값, ...}
+        data: dict, {"카테고리": 값, ...} 또는 미리 나눈 (labels, values)
             예: {"일반": 3500, "학생": 1200, "초대권": 300}
         title: 차트 제목
-        output_path: 저장 경로 (None이면 임시 파일)
+        output_path: 저장 경로 (None이면 입력값 해시로 정한 임시 파일 — 같은 입력이면 재사용)
+        return_bytes: True면 파일을 쓰지 않고 PNG 바이트를 반환
 
     Returns:
-        저장된 파일 경로
+        저장된 파일 경로 (return_bytes=True면 PNG 바이트)
     """
-    if output_path is None:
-        output_path = tempfile.mktemp(suffix='.png')
+    return _finalize("visitor_pie", _render_visitor_pie, (*_split(data), title),
+                     output_path, return_bytes)
 
-    font_prop = get_font_prop()
 
-    fig, ax = plt.subplots(1, 1, figsize=(6, 5))
+@st.cache_data(show_spinner=False)
+def _render_visitor_pie(labels, values, title):
+    """입력이 같으면 재렌더링 없이 캐시된 PNG 반환 (Pillow 렌더링은 가벼워 현재 프로세스에서 실행)"""
+    return _draw_visitor_pie(labels, values, title)
 
-    labels = list(data.keys())
-    values = list(data.values())
-    total = sum(values)
 
-    # 색상 팔레트
-    colors = ['#4472C4', '#ED7D31', '#A5A5A5', '#FFC000', '#5B9BD5',
-              '#70AD47', '#264478', '#9B59B6'][:len(labels)]
+def _draw_visitor_pie(labels, values, title):
+    """관객 구성 도넛형 파이차트 PNG 바이트 (Pillow로 직접 그림)"""
+    total = values.sum()
+    colors = CHART_COLORS[:len(labels)]
 
-    def autopct_func(pct):
-        absolute = int(round(pct / 100.0 * total))
-        return f'{pct:.1f}%\n({absolute:,}명)'
+    title_font, label_font = _pil_font(14), _pil_font(9)
+    measure = ImageDraw.Draw(Image.new('RGB', (1, 1)))
 
-    wedges, texts, autotexts = ax.pie(
-        values,
-        labels=None,
-        autopct=autopct_func,
-        startangle=90,
-        colors=colors,
-        pctdistance=0.65,
-        wedgeprops=dict(width=0.85, edgecolor='white', linewidth=2)
-    )
+    # 레이아웃: 제목 / 원 (반지름 R) / 오른쪽 범례
+    pad, radius = _pt(7), 400
+    title_w, title_h = _text_size(measure, title, title_font)
+    pie_top = pad + title_h + _pt(20)
+    cx, cy = pad + radius, pie_top + radius
 
-    # 텍스트 스타일
-    for autotext in autotexts:
-        autotext.set_fontsize(9)
-        if font_prop:
-            autotext.set_fontproperties(font_prop)
+    legend_labels = [f'{l} ({v:,}명)' for l, v in zip(labels, values)]
+    line_h = round(label_font.size * 1.6)
+    swatch = round(label_font.size * 0.8)
+    text_w = max((_text_size(measure, t, label_font)[0] for t in legend_labels), default=0)
+    legend_w = _pt(6) + swatch + _pt(6) + text_w + _pt(6)
+    legend_h = line_h * len(legend_labels) + _pt(6)
+    legend_x = cx + radius + _pt(20)
+    legend_y = cy - legend_h // 2
+
+    width = max(legend_x + legend_w, cx + title_w // 2) + pad
+    height = max(cy + radius, legend_y + legend_h) + pad
+    img = Image.new('RGB', (width, height), 'white')
+    draw = ImageDraw.Draw(img)
+
+    draw.text((cx, pad), title, font=title_font, fill='black', anchor='mt',
+              stroke_width=1, stroke_fill='black')
+
+    # 조각: 12시 방향에서 반시계 방향 (Pillow 각도는 시계 방향이므로 부호 반전)
+    box = (cx - radius, cy - radius, cx + radius, cy + radius)
+    if total > 0:
+        # 조각 각도와 라벨 문자열을 한 번에 계산
+        vals = values.astype(float)
+        spans = vals * (360.0 / total)
+        starts = 90.0 + np.concatenate(([0.0], np.cumsum(spans)[:-1]))
+        mids = np.radians(starts + spans / 2)
+        label_x = cx + 0.65 * radius * np.cos(mids)
+        label_y = cy - 0.65 * radius * np.sin(mids)
+        pct_labels = [f'{p:.1f}%\n({v:,.0f}명)' for p, v in zip((vals / total * 100).tolist(), vals.tolist())]
+
+        for start, span, color in zip(starts.tolist(), spans.tolist(), colors):
+            if span > 0:
+                draw.pieslice(box, -(start + span), -start, fill=color, outline='white', width=_pt(2))
+        hole = radius * 0.15
+        draw.ellipse((cx - hole, cy - hole, cx + hole, cy + hole), fill='white')
+
+        for x, y, text in zip(label_x.tolist(), label_y.tolist(), pct_labels):
+            draw.multiline_text((x, y), text, font=label_font, fill='black', anchor='mm', align='center')
 
     # 범례
-    legend_labels = [f'{l} ({v:,}명)' for l, v in zip(labels, values)]
-    legend = ax.legend(
-        wedges, legend_labels,
-        title="",
-        loc="center left",
-        bbox_to_anchor=(1, 0, 0.5, 1),
-        fontsize=9,
-        prop=font_prop
-    )
-
-    if font_prop:
-        ax.set_title(title, fontsize=14, fontweight='bold', fontproperties=font_prop, pad=20)
-    else:
-        ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
-
-    plt.tight_layout()
-    fig.savefig(output_path, dpi=200, bbox_inches='tight', facecolor='white')
-    plt.close(fig)
+    draw.rounded_rectangle((legend_x, legend_y, legend_x + legend_w, legend_y + legend_h),
+                           radius=_pt(2), outline='#CCCCCC', width=2, fill='white')
+    for i, (text, color) in enumerate(zip(legend_labels, colors)):
+        row_y = legend_y + _pt(3) + line_h * i + line_h // 2
+        sx = legend_x + _pt(6)
+        draw.rectangle((sx, row_y - swatch // 2, sx + swatch, row_y + swatch // 2), fill=color)
+        draw.text((sx + swatch + _pt(6), row_y), text, font=label_font, fill='black', anchor='lm')
 
-    return output_path
+    return _encode_png(img)
 
 
 # ──────────────────────────────────────────────
 # 파이차트: 유형별 관객 구성
 # ──────────────────────────────────────────────
 
-def create_visitor_type_chart(data, title="유형별 관객 구성", output_path=None):
+def create_visitor_type_chart(data, title="유형별 관객 구성", output_path=None, return_bytes=False):
     """유형별 관객 구성 파이차트
 
     Args:
         data: dict, {"개인": 4000, "미술대학 단체": 500, ...}
     """
-    return create_visitor_pie_chart(data, title=title, output_path=output_path)
+    return create_visitor_pie_chart(data, title=title, output_path=output_path,
+                                    return_bytes=return_bytes)
 
 
 # ──────────────────────────────────────────────
 # 바 차트: 주별 관객 수
 # ──────────────────────────────────────────────
 
-def create_weekly_visitors_chart(data, title="주별 관객 수", output_path=None):
+def create_weekly_visitors_chart(data, title="주별 관객 수", output_path=None, return_bytes=False):
     """주별 관객 수 바 차트 생성
 
     Args:
-        data: dict, {"1주": 500, "2주": 620, ...}
+        data: dict, {"1주": 500, "2주": 620, ...} 또는 미리 나눈 (labels, values)
         title: 차트 제목
         output_path: 저장 경로
+        return_bytes: True면 파일을 쓰지 않고 PNG 바이트를 반환
 
     Returns:
-        저장된 파일 경로
+        저장된 파일 경로 (return_bytes=True면 PNG 바이트)
     """
-    if output_path is None:
-        output_path = tempfile.mktemp(suffix='.png')
+    return _finalize("weekly_visitors", _render_weekly_visitors, (*_split(data), title),
+                     output_path, return_bytes)
 
-    font_prop = get_font_prop()
 
-    fig, ax = plt.subplots(figsize=(10, 5))
+@st.cache_data(show_spinner=False)
+def _render_weekly_visitors(weeks, values, title):
+    return _draw_weekly_visitors(weeks, values, title)
 
-    weeks = list(data.keys())
-    values = list(data.values())
-    x = range(len(weeks))
 
-    bars = ax.bar(x, values, color='#4472C4', width=0.6, edgecolor='white', linewidth=0.5)
+def _draw_weekly_visitors(weeks, values, title):
+    """주별 관객 수 바 차트 PNG 바이트 (Pillow로 직접 그림)"""
+    weeks = [str(w) for w in weeks]
+    vmax = (values.max() if values.size else 0) or 1
 
-    # 값 표시
-    for bar, val in zip(bars, values):
-        ax.text(bar.get_x() + bar.get_width() / 2., bar.get_height() + max(values) * 0.02,
-                f'{val:,}', ha='center', va='bottom', fontsize=9,
-                fontproperties=font_prop)
+    title_font, tick_font, axis_font = _pil_font(14), _pil_font(9), _pil_font(10)
+    ylabel = '관객 수 (명)' if korean_font_file() else 'Visitors'
 
-    ax.set_xticks(x)
-    if font_prop:
-        ax.set_xticklabels(weeks, fontproperties=font_prop, fontsize=9)
-        ax.set_title(title, fontsize=14, fontweight='bold', fontproperties=font_prop, pad=15)
-        ax.set_ylabel('관객 수 (명)', fontproperties=font_prop, fontsize=10)
-    else:
-        ax.set_xticklabels(weeks, fontsize=9)
-        ax.set_title(title, fontsize=14, fontweight='bold', pad=15)
-        ax.set_ylabel('Visitors', fontsize=10)
+    # y축 눈금: 값 라벨이 들어갈 여유를 두고 보기 좋은 간격으로
+    step = _nice_step(vmax * 1.1 / 5)
+    ticks = [step * i for i in range(int(vmax * 1.1 // step) + 2)]
+    ytop = ticks[-1]
+    tick_labels = [f'{t:,.0f}' for t in ticks]
 
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    ax.grid(axis='y', alpha=0.3)
+    width, height = 2000, 1000
+    img = Image.new('RGB', (width, height), 'white')
+    draw = ImageDraw.Draw(img)
 
-    plt.tight_layout()
-    fig.savefig(output_path, dpi=200, bbox_inches='tight', facecolor='white')
-    plt.close(fig)
+    pad, tick_len = _pt(7), _pt(3.5)
+    _, title_h = _text_size(draw, title, title_font)
+    ylabel_w, ylabel_h = _text_size(draw, ylabel, axis_font)
+    tick_w = max(_text_size(draw, t, tick_font)[0] for t in tick_labels)
+    xtick_h = max((_text_size(draw, w, tick_font)[1] for w in weeks), default=0)
 
-    return output_path
+    left = pad + ylabel_h + _pt(4) + tick_w + _pt(3.5) + tick_len
+    right = width - pad
+    top = pad + title_h + _pt(15)
+    bottom = height - pad - xtick_h - _pt(3.5) - tick_len
+
+    def y_of(v):
+        return bottom - (bottom - top) * v / ytop
+
+    draw.text(((left + right) / 2, pad), title, font=title_font, fill='black', anchor='mt',
+              stroke_width=1, stroke_fill='black')
+
+    # 격자 + y축 눈금
+    for t, label in zip(ticks, tick_labels):
+        y = round(y_of(t))
+        draw.line((left, y, right, y), fill='#E7E7E7', width=2)
+        draw.line((left - tick_len, y, left, y), fill='black', width=2)
+        draw.text((left - tick_len - _pt(3.5), y), label, font=tick_font, fill='black', anchor='rm')
+
+    # 막대 + 값 라벨 + x축 눈금
+    slot = (right - left) / max(len(values), 1)
+    for i, (week, val) in enumerate(zip(weeks, values.tolist())):
+        xc = left + slot * (i + 0.5)
+        half = slot * 0.3
+        draw.rectangle((round(xc - half), round(y_of(val)), round(xc + half), bottom),
+                       fill='#4472C4', outline='white', width=1)
+        draw.text((xc, y_of(val + vmax * 0.02)), f'{val:,}', font=tick_font, fill='black', anchor='md')
+        draw.line((xc, bottom, xc, bottom + tick_len), fill='black', width=2)
+        draw.text((xc, bottom + tick_len + _pt(3.5)), week, font=tick_font, fill='black', anchor='mt')
+
+    # 축선 (위/오른쪽 제외)
+    draw.line((left, top, left, bottom), fill='black', width=2)
+    draw.line((left, bottom, right, bottom), fill='black', width=2)
+
+    # y축 제목 (90도 회전)
+    label_img = Image.new('RGB', (ylabel_w + 4, ylabel_h + 8), 'white')
+    ImageDraw.Draw(label_img).text((0, 0), ylabel, font=axis_font, fill='black', anchor='lt')
+    label_img = label_img.rotate(90, expand=True)
+    img.paste(label_img, (pad, round((top + bottom - label_img.height) / 2)))
+
+    return _encode_png(img)
 
 
 # ──────────────────────────────────────────────
@@ -207,7 +467,8 @@ def create_weekly_visitors_chart(data, title="주별 관객 수", output_path=No
 # ──────────────────────────────────────────────
 
 def create_budget_comparison_chart(categories, planned, actual,
-                                    title="예산 계획 대비 집행", output_path=None):
+                                    title="예산 계획 대비 집행", output_path=None,
+                                    return_bytes=False):
     """예산 계획 대비 집행 비교 바 차트
 
     Args:
@@ -216,16 +477,26 @@ def create_budget_comparison_chart(categories, planned, actual,
         actual: list, [집행액, ...]
         title: 차트 제목
         output_path: 저장 경로
+        return_bytes: True면 파일을 쓰지 않고 PNG 바이트를 반환
 
     Returns:
-        저장된 파일 경로
+        저장된 파일 경로 (return_bytes=True면 PNG 바이트)
     """
-    if output_path is None:
-        output_path = tempfile.mktemp(suffix='.png')
+    return _finalize("budget_comparison", _render_budget_comparison,
+                     (tuple(categories), tuple(planned), tuple(actual), title),
+                     output_path, return_bytes)
+
+
+@st.cache_data(show_spinner=False)
+def _render_budget_comparison(categories, planned, actual, title):
+    return _draw_locked(_draw_budget_comparison, categories, planned, actual, title)
 
-    font_prop = get_font_prop()
 
-    fig, ax = plt.subplots(figsize=(8, 5))
+def _draw_budget_comparison(categories, planned, actual, title):
+    """예산 계획 대비 집행 비교 바 차트 PNG 바이트"""
+    has_korean_font = setup_korean_font() is not None
+
+    fig, ax = _get_figure((8, 5))
 
     x = range(len(categories))
     width = 0.35
@@ -236,43 +507,27 @@ def create_budget_comparison_chart(categories, planned, actual,
                    label='집행', color='#ED7D31', edgecolor='white')
 
     ax.set_xticks(x)
-    if font_prop:
-        ax.set_xticklabels(categories, fontproperties=font_prop, fontsize=10)
-        ax.set_title(title, fontsize=14, fontweight='bold', fontproperties=font_prop, pad=15)
-        ax.set_ylabel('금액 (원)', fontproperties=font_prop, fontsize=10)
-        ax.legend(prop=font_prop, fontsize=10)
-    else:
-        ax.set_xticklabels(categories, fontsize=10)
-        ax.set_title(title, fontsize=14, fontweight='bold', pad=15)
-        ax.set_ylabel('Amount', fontsize=10)
-        ax.legend(fontsize=10)
-
-    # 값 표시
-    def format_amount(val):
-        if val >= 10000:
-            return f'{val / 10000:.0f}만'
-        return f'{val:,.0f}'
-
-    for bar in bars1:
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width() / 2., height,
-                format_amount(height), ha='center', va='bottom', fontsize=8,
-                fontproperties=font_prop)
-    for bar in bars2:
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width() / 2., height,
-                format_amount(height), ha='center', va='bottom', fontsize=8,
-                fontproperties=font_prop)
+    ax.set_xticklabels(categories, fontsize=10)
+    ax.set_title(title, fontsize=14, fontweight='bold', pad=15)
+    ax.set_ylabel('금액 (원)' if has_korean_font else 'Amount', fontsize=10)
+    ax.legend(fontsize=10)
+
+    # 값 표시 (1만 이상은 '만' 단위) — 라벨 문자열을 막대 그리기 전에 한 번에 준비
+    def format_amounts(vals):
+        vals = np.asarray(vals, dtype=float)
+        big = vals >= 10000
+        scaled = np.where(big, vals / 10000, vals)
+        return [f'{s:.0f}만' if b else f'{s:,.0f}' for s, b in zip(scaled.tolist(), big.tolist())]
+
+    for bars, values in ((bars1, planned), (bars2, actual)):
+        ax.bar_label(bars, labels=format_amounts(values), padding=3, fontsize=8)
 
     ax.spines['top'].set_visible(False)
     ax.spines['right'].set_visible(False)
     ax.grid(axis='y', alpha=0.3)
 
-    plt.tight_layout()
-    fig.savefig(output_path, dpi=200, bbox_inches='tight', facecolor='white')
-    plt.close(fig)
-
-    return output_path
+    fig.tight_layout()
+    return _to_png(fig)
 
 
 # 하위 호환: 기존 함수 이름 유지
@@ -7,9 +7,11 @@
 """
 
 import os
+import re
+import weakref
 import numpy as np
 import pandas as pd
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 # ──────────────────────────────────────────────
@@ -39,6 +41,13 @@ NUMERIC_COLUMNS = [
     "멤버십 회원수", "멤버십 증가율",
 ]
 
+# 매체별 출품 작품 수 컬럼 → 매체 라벨
+MEDIA_FIELDS = [
+    ("출품 작품 수_회화", "회화"), ("출품 작품 수_조각", "조각"),
+    ("출품 작품 수_사진", "사진"), ("출품 작품 수_설치", "설치"),
+    ("출품 작품 수_미디어", "미디어"), ("출품 작품 수_기타", "기타"),
+]
+
 # 유사 전시 검색에 사용할 핵심 비교 필드 및 가중치
 SIMILARITY_FIELDS = {
     "총 사용 예산": 0.35,
@@ -67,37 +76,86 @@ def load_reference(xlsx_path: str) -> pd.DataFrame:
     if not os.path.exists(xlsx_path):
         raise FileNotFoundError(f"레퍼런스 파일을 찾을 수 없습니다: {xlsx_path}")
 
-    # Row 1(0-indexed) = 컬럼명, skiprows=[0]으로 카테고리 헤더 건너뜀
-    df = pd.read_excel(
-        xlsx_path,
-        sheet_name=0,
-        header=1,      # Row 2 (0-indexed=1) 를 컬럼명으로
-        engine="openpyxl",
-    )
+    # 같은 파일(경로 + 수정 시각 + 크기)이면 파싱 결과 재사용 — 호출자가 수정해도
+    # 캐시가 바뀌지 않도록 얕은 복사본 반환 (copy-on-write)
+    key = _reference_cache_key(xlsx_path)
+    cached = _REF_CACHE.get(key)
+    if cached is None:
+        cached = _REF_CACHE[key] = _parse_reference(xlsx_path)
+    return cached.copy(deep=False)
+
+
+# load_reference 결과 캐시: (절대 경로, mtime, size) → DataFrame
+_REF_CACHE: dict[tuple, pd.DataFrame] = {}
 
-    # 빈 행 제거 (전시 제목이 없는 행)
-    df = df.dropna(subset=["전시 제목"], how="all")
-    df = df[df["전시 제목"].astype(str).str.strip() != ""]
 
-    # '-' 문자를 NaN으로 변환
-    df = df.replace("-", np.nan)
-    df = df.replace("—", np.nan)
-    df = df.replace("", np.nan)
+def _reference_cache_key(xlsx_path: str) -> tuple:
+    return (os.path.abspath(xlsx_path), os.path.getmtime(xlsx_path), os.path.getsize(xlsx_path))
 
-    # 숫자 컬럼 변환
-    for col in NUMERIC_COLUMNS:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
 
-    # 전시 유형 컬럼 숫자 변환
-    if "전시 유형" in df.columns:
-        df["전시 유형"] = pd.to_numeric(df["전시 유형"], errors="coerce")
+# 읽는 시점에 NaN으로 처리할 자리표시 값 (pandas 기본 NA 문자열에 추가)
+_NA_VALUES = ["-", "—", "", " "]
+
+
+def _parse_reference(xlsx_path: str) -> pd.DataFrame:
+    """레퍼런스 Excel 파싱 (load_reference의 캐시 미스 경로)"""
+    # Row 1(0-indexed) = 컬럼명, skiprows=[0]으로 카테고리 헤더 건너뜀
+    # calamine(Rust) 엔진이 openpyxl보다 훨씬 빠름 — 미설치(ImportError)이거나
+    # 엔진을 모르는 pandas 2.2 미만(ValueError)이면 openpyxl 사용
+    try:
+        df = pd.read_excel(
+            xlsx_path,
+            sheet_name=0,
+            header=1,      # Row 2 (0-indexed=1) 를 컬럼명으로
+            na_values=_NA_VALUES,
+            engine="calamine",
+        )
+    except (ImportError, ValueError):
+        df = pd.read_excel(xlsx_path, sheet_name=0, header=1, na_values=_NA_VALUES, engine="openpyxl")
+
+    # 빈 행 제거 (전시 제목이 없거나 공백뿐인 행) — 한 마스크로 한 번만 행 추출
+    title = df["전시 제목"]
+    df = df[title.notna() & (title.astype(str).str.strip() != "")]
+
+    # 숫자 컬럼 + 전시 유형 컬럼 일괄 변환
+    cols = [c for c in (*NUMERIC_COLUMNS, "전시 유형") if c in df.columns]
+    df[cols] = df[cols].apply(pd.to_numeric, errors="coerce").astype("float64")
 
     # No. 컬럼 정리
     if "No." in df.columns:
         df["No."] = range(1, len(df) + 1)
 
-    df = df.reset_index(drop=True)
+    # copy()로 컬럼별로 흩어진 블록을 통합 → 숫자 컬럼이 하나의 연속 float64
+    # 2차원 배열에 모여 컬럼 추출/유사도 행렬 생성 시 블록 간 gather가 없음
+    df = df.reset_index(drop=True).copy()
+    return df
+
+
+def load_reference_cached(xlsx_path: str) -> pd.DataFrame:
+    """
+    load_reference와 같지만, 파싱 결과를 Excel 옆 Parquet 파일로 저장해 두고
+    다음 실행부터는 Parquet을 읽음 (Excel보다 수배~수십 배 빠름).
+
+    Excel이 Parquet보다 새로우면 다시 파싱. pyarrow가 없거나 파일을 쓸 수 없는
+    환경에서는 매번 Excel을 읽음.
+    """
+    parquet_path = os.path.splitext(xlsx_path)[0] + ".parquet"
+    try:
+        if (os.path.exists(parquet_path)
+                and os.path.getmtime(parquet_path) >= os.path.getmtime(xlsx_path)):
+            return pd.read_parquet(parquet_path, engine="pyarrow")
+    except (ImportError, OSError, ValueError):
+        pass
+
+    df = load_reference(xlsx_path)
+    tmp_path = f"{parquet_path}.{os.getpid()}.tmp"
+    try:
+        df.to_parquet(tmp_path, engine="pyarrow")
+        os.replace(tmp_path, parquet_path)
+    except Exception:
+        # 캐시 저장 실패는 무시 (pyarrow 미설치, 읽기 전용 디렉터리, 변환 불가 타입 등)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
     return df
 
 
@@ -117,8 +175,9 @@ class FieldStats:
     std: float
     q25: float          # 25th percentile
     q75: float          # 75th percentile
-    values: list        # 전체 유효 값 리스트 (순위 계산용)
-    titles: list        # 대응하는 전시 제목 리스트
+    values: np.ndarray  # 전체 유효 값 배열 (float64, 순위 계산용)
+    titles: np.ndarray  # 대응하는 전시 제목 배열
+    sorted_values: np.ndarray = field(default=None, repr=False)  # 오름차순 정렬 값 (백분위/순위 이진 탐색용)
 
 
 def compute_stats(df: pd.DataFrame, column: str) -> FieldStats | None:
@@ -135,40 +194,53 @@ def compute_stats(df: pd.DataFrame, column: str) -> FieldStats | None:
     if column not in df.columns:
         return None
 
-    series = df[column].dropna()
+    # 유효 값 마스크를 한 번만 만들어 값과 대응하는 전시 제목에 함께 사용
+    col = df[column]
+    valid_mask = col.notna().to_numpy()
+    series = col[valid_mask]
     if len(series) < 2:
         return None
 
-    # 유효 값과 대응하는 전시 제목
-    valid_mask = df[column].notna()
-    values = df.loc[valid_mask, column].tolist()
-    titles = df.loc[valid_mask, "전시 제목"].tolist()
+    values = series.to_numpy(dtype=float)
+    titles = df["전시 제목"].to_numpy()[valid_mask]
+
+    # 한 번 정렬해 두면 최소/최대는 양 끝값, 사분위는 한 번의 quantile 호출
+    # (평균·표준편차·중앙값은 pandas와 같은 합산 순서/공식을 써서 결과를 비트 단위로 유지)
+    sorted_values = np.sort(values)
+    q25, q75 = np.quantile(sorted_values, [0.25, 0.75])
 
     return FieldStats(
         field_name=column,
-        count=len(series),
-        mean=float(series.mean()),
-        median=float(series.median()),
-        min_val=float(series.min()),
-        max_val=float(series.max()),
-        std=float(series.std()),
-        q25=float(series.quantile(0.25)),
-        q75=float(series.quantile(0.75)),
+        count=len(values),
+        mean=float(values.mean()),
+        median=float(np.median(sorted_values)),
+        min_val=float(sorted_values[0]),
+        max_val=float(sorted_values[-1]),
+        std=float(values.std(ddof=1)),
+        q25=float(q25),
+        q75=float(q75),
         values=values,
         titles=titles,
+        sorted_values=sorted_values,
     )
 
 
+def _sorted_values(stats: FieldStats) -> np.ndarray:
+    if stats.sorted_values is None:
+        stats.sorted_values = np.sort(np.asarray(stats.values, dtype=float))
+    return stats.sorted_values
+
+
 def compute_percentile(stats: FieldStats, value: float) -> int:
     """
     주어진 값의 백분위를 계산합니다 (0-100).
     """
     if stats is None or stats.count == 0:
         return 50
-    sorted_vals = sorted(stats.values)
-    below = sum(1 for v in sorted_vals if v < value)
-    equal = sum(1 for v in sorted_vals if v == value)
-    percentile = (below + equal * 0.5) / len(sorted_vals) * 100
+    arr = _sorted_values(stats)
+    below = int(np.searchsorted(arr, value, side="left"))
+    equal = int(np.searchsorted(arr, value, side="right")) - below
+    percentile = (below + equal * 0.5) / len(arr) * 100
     return int(round(percentile))
 
 
@@ -181,25 +253,44 @@ def compute_rank(stats: FieldStats, value: float, ascending: bool = False) -> in
     """
     if stats is None or stats.count == 0:
         return 0
+    # 같은 값(차이 0.01 미만)이면 가장 좋은 순위, 없으면 삽입 위치 기준.
+    # 두 경우 모두 "허용 오차 밖에서 더 좋은 값의 개수 + 1"로 귀결되며,
+    # 정렬된 배열의 (v - value)도 정렬 상태이므로 이진 탐색으로 셉니다.
+    diff = _sorted_values(stats) - value
     if ascending:
-        sorted_vals = sorted(stats.values)
+        better = int(np.searchsorted(diff, -0.01, side="right"))
     else:
-        sorted_vals = sorted(stats.values, reverse=True)
-    # 같은 값이면 가장 좋은 순위
-    for i, v in enumerate(sorted_vals):
-        if abs(v - value) < 0.01 or v == value:
-            return i + 1
-    # 값이 리스트에 없으면 삽입 위치 기준
-    for i, v in enumerate(sorted_vals):
-        if (not ascending and value > v) or (ascending and value < v):
-            return i + 1
-    return len(sorted_vals) + 1
+        better = len(diff) - int(np.searchsorted(diff, 0.01, side="left"))
+    return better + 1
 
 
 # ──────────────────────────────────────────────
 # 유사 전시 검색
 # ──────────────────────────────────────────────
 
+# get_similar_exhibitions용 df별 캐시: id(df) → (필드 위치, 값 행렬, 열 범위, 사용 가능 열)
+# (df가 사라지면 weakref.finalize로 제거되므로 id 재사용 문제 없음)
+_SIM_STATS: dict[int, tuple] = {}
+
+
+def _similarity_stats(df: pd.DataFrame) -> tuple:
+    """SIMILARITY_FIELDS 값 행렬과 열별 범위 (0/NaN 제외 유효값 2개 이상, 범위 0 아님)"""
+    cached = _SIM_STATS.get(id(df))
+    if cached is None:
+        fields = [f for f in SIMILARITY_FIELDS if f in df.columns]
+        arr = df[fields].to_numpy(dtype=float)
+        valid = ~np.isnan(arr) & (arr != 0)
+        usable = valid.sum(axis=0) >= 2
+        masked = np.where(valid, arr, np.nan)
+        col_range = np.zeros(len(fields))
+        col_range[usable] = np.nanmax(masked[:, usable], axis=0) - np.nanmin(masked[:, usable], axis=0)
+        usable &= col_range != 0
+        cached = ({f: i for i, f in enumerate(fields)}, arr, col_range, usable)
+        _SIM_STATS[id(df)] = cached
+        weakref.finalize(df, _SIM_STATS.pop, id(df), None)
+    return cached
+
+
 def get_similar_exhibitions(
     df: pd.DataFrame,
     current: dict,
@@ -223,46 +314,39 @@ def get_similar_exhibitions(
     if df.empty:
         return pd.DataFrame()
 
-    scores = pd.Series(0.0, index=df.index)
-    total_weight = 0.0
-
-    for field, weight in SIMILARITY_FIELDS.items():
-        if field not in current or current[field] is None:
-            continue
-        if field not in df.columns:
-            continue
-
-        current_val = float(current[field])
-        if current_val == 0:
-            continue
-
-        col = df[field].copy()
-        valid = col.notna() & (col != 0)
-
-        if valid.sum() < 2:
-            continue
-
-        # 정규화된 차이 계산 (0 = 동일, 1 = 매우 다름)
-        col_range = col[valid].max() - col[valid].min()
-        if col_range == 0:
-            continue
-
-        diff = (col - current_val).abs() / col_range
-        diff = diff.clip(upper=1.0)
-        diff = diff.fillna(1.0)  # 데이터 없으면 최대 차이
-
-        scores += diff * weight
-        total_weight += weight
+    # 비교 대상 필드 (현재 값이 있고 0이 아닌 필드)
+    fields = [
+        f for f in SIMILARITY_FIELDS
+        if current.get(f) is not None and f in df.columns and float(current[f]) != 0
+    ]
+    if not fields:
+        return df.head(top_n)
 
-    if total_weight == 0:
+    # 필드 × 전시 행렬과 열 범위는 df마다 한 번만 계산해 두고 필요한 열만 골라 씀
+    positions, matrix, ranges, usable_cols = _similarity_stats(df)
+    cols = [positions[f] for f in fields]
+    arr = matrix[:, cols]
+    col_range = ranges[cols]
+    usable = usable_cols[cols]
+    cur_vec = np.array([float(current[f]) for f in fields])
+    weights = np.array([SIMILARITY_FIELDS[f] for f in fields])
+    if not usable.any():
         return df.head(top_n)
 
-    scores = scores / total_weight  # 0~1 정규화
-    df_result = df.copy()
-    df_result["_similarity_score"] = 1 - scores  # 1에 가까울수록 유사
-    df_result = df_result.sort_values("_similarity_score", ascending=False)
+    # 정규화된 차이 계산 (0 = 동일, 1 = 매우 다름), 데이터 없으면 최대 차이
+    # — 하나의 버퍼를 제자리 연산으로 재사용해 단계마다 임시 배열을 만들지 않음
+    diff = np.subtract(arr[:, usable], cur_vec[usable])
+    np.abs(diff, out=diff)
+    np.divide(diff, col_range[usable], out=diff)
+    np.minimum(diff, 1.0, out=diff)
+    np.nan_to_num(diff, copy=False, nan=1.0)
 
-    return df_result.head(top_n)
+    weights = weights[usable]
+    # 가중합을 행렬-벡터 곱 한 번으로 계산하고 0~1로 정규화
+    scores = pd.Series((diff @ weights) / weights.sum(), index=df.index)
+    similarity = (1 - scores).sort_values(ascending=False).head(top_n)  # 1에 가까울수록 유사
+    # 전체 복사 대신 상위 top_n 행만 잘라 점수 컬럼 추가
+    return df.loc[similarity.index].assign(_similarity_score=similarity)
 
 
 # ──────────────────────────────────────────────
@@ -273,12 +357,35 @@ EXHIBITION_TYPE_COL = "전시 유형"
 EXCLUDED_TYPE = 0  # 유형 0은 분석에서 제외 (특수 전시)
 
 
+def _type_series(df: pd.DataFrame) -> pd.Series:
+    """전시 유형 컬럼 (load_reference에서 이미 숫자로 변환됐으면 그대로 사용)"""
+    type_series = df[EXHIBITION_TYPE_COL]
+    if pd.api.types.is_numeric_dtype(type_series):
+        return type_series
+    return pd.to_numeric(type_series, errors="coerce")
+
+
+# 유형 필터 결과의 df별 캐시: id(df) → {(종류, 유형): 결과}
+# rerun마다 같은 레퍼런스로 반복되는 마스크 생성·행 추출을 건너뜀
+# (df가 사라지면 weakref.finalize로 제거 — 결과가 df 자신을 참조하지 않도록 df는 저장하지 않음)
+_TYPE_VIEWS: dict[int, dict] = {}
+
+
+def _type_view(df: pd.DataFrame, key: tuple, compute):
+    views = _TYPE_VIEWS.get(id(df))
+    if views is None:
+        views = _TYPE_VIEWS[id(df)] = {}
+        weakref.finalize(df, _TYPE_VIEWS.pop, id(df), None)
+    if key not in views:
+        views[key] = compute()
+    return views[key]
+
+
 def exclude_type_zero(df: pd.DataFrame) -> pd.DataFrame:
     """유형 0(특수 전시)을 DataFrame에서 제외합니다."""
     if EXHIBITION_TYPE_COL not in df.columns:
         return df
-    type_series = pd.to_numeric(df[EXHIBITION_TYPE_COL], errors="coerce")
-    return df[type_series != EXCLUDED_TYPE]
+    return _type_view(df, ("exclude", None), lambda: df[_type_series(df) != EXCLUDED_TYPE])
 
 
 def filter_by_type(df: pd.DataFrame, exhibition_type) -> pd.DataFrame:
@@ -293,28 +400,48 @@ def filter_by_type(df: pd.DataFrame, exhibition_type) -> pd.DataFrame:
     Returns:
         필터링된 DataFrame. 같은 유형이 3개 미만이면 유형 0 제외 전체 반환.
     """
-    # 유형 0은 항상 제외
-    df = exclude_type_zero(df)
-
     if exhibition_type is None or EXHIBITION_TYPE_COL not in df.columns:
-        return df
-
-    # 유형 컬럼을 숫자로 변환
-    type_series = pd.to_numeric(df[EXHIBITION_TYPE_COL], errors="coerce")
+        return exclude_type_zero(df)
     try:
         target = float(exhibition_type)
     except (ValueError, TypeError):
-        return df
+        return exclude_type_zero(df)
+
+    return _type_view(df, ("filter", target), lambda: _filter_by_type(df, target))
+
 
-    filtered = df[type_series == target]
+def _filter_by_type(df: pd.DataFrame, target: float) -> pd.DataFrame:
+    # 유형 0 제외와 동일 유형 조건을 한 마스크로 결합
+    type_series = _type_series(df)
+    not_excluded = type_series != EXCLUDED_TYPE
+    filtered = df[not_excluded & (type_series == target)]
 
     # 같은 유형이 3개 미만이면 의미 있는 비교가 어려우므로 전체 사용
     if len(filtered) < 3:
-        return df
+        return exclude_type_zero(df)
 
     return filtered
 
 
+def get_type_count(df: pd.DataFrame, exhibition_type) -> int:
+    """특정 유형의 전시 수를 반환합니다."""
+    if exhibition_type is None or EXHIBITION_TYPE_COL not in df.columns:
+        return len(df)
+    try:
+        target = float(exhibition_type)
+    except (ValueError, TypeError):
+        return len(df)
+    return get_type_counts(df).get(target, 0)
+
+
+def get_type_counts(df: pd.DataFrame) -> dict[float, int]:
+    """유형별 전시 수 {유형: 개수} — value_counts 한 번으로 모든 유형을 집계"""
+    if EXHIBITION_TYPE_COL not in df.columns:
+        return {}
+    return _type_view(df, ("counts", None),
+                      lambda: {float(t): int(n) for t, n in _type_series(df).value_counts().items()})
+
+
 def get_type_label(exhibition_type) -> str:
     """유형 번호를 표시용 라벨로 변환합니다."""
     if exhibition_type is None:
@@ -326,18 +453,6 @@ def get_type_label(exhibition_type) -> str:
     return f"{t}유형"
 
 
-def get_type_count(df: pd.DataFrame, exhibition_type) -> int:
-    """특정 유형의 전시 수를 반환합니다."""
-    if exhibition_type is None or EXHIBITION_TYPE_COL not in df.columns:
-        return len(df)
-    type_series = pd.to_numeric(df[EXHIBITION_TYPE_COL], errors="coerce")
-    try:
-        target = float(exhibition_type)
-    except (ValueError, TypeError):
-        return len(df)
-    return int((type_series == target).sum())
-
-
 # ──────────────────────────────────────────────
 # 파생 지표 계산
 # ──────────────────────────────────────────────
@@ -352,53 +467,72 @@ def compute_derived_metrics(df: pd.DataFrame) -> pd.DataFrame:
         - 유료_비율: 유료 관객수 ÷ 총 관객수
         - 프로그램_참여율: 프로그램 참여 인원 ÷ 총 관객수
         - 관객당_보도건수: 총 관객수 ÷ 언론 보도 건수
+        - 전시비_비율: 전시 사용 예산 ÷ 총 사용 예산
+        - 인력당_관객: 총 관객수 ÷ 운영 인력_총
+        - 매체비율_{매체}: 출품 작품 수_{매체} ÷ 출품 작품 수_총 (매체별 6개)
     """
-    df = df.copy()
+    # 원본 전체를 복사하지 않고 새 컬럼만 모아 마지막에 assign
+    new_cols = {}
+
+    # 분모 배열과 "0보다 큼" 마스크(NaN은 False)를 한 번만 만들어 재사용
+    def col(name):
+        return df[name].to_numpy(dtype=float)
+
+    def ratio(num, den, mask):
+        """mask인 행만 num / den, 나머지는 NaN"""
+        return np.divide(num, den, out=np.full(np.shape(num), np.nan), where=mask)
+
+    visitors = col("총 관객수")
+    budget = col("총 사용 예산")
+    press = col("언론 보도 건수")
+    has_visitors = visitors > 0
+    has_budget = budget > 0
 
     # 관객당 비용 (원) — 필터링 없이 원본 비율 그대로 보존
     # (전시 유형별 비교로 이상값 문제를 해결)
-    with np.errstate(divide="ignore", invalid="ignore"):
-        df["관객당_비용"] = np.where(
-            (df["총 관객수"].notna()) & (df["총 관객수"] > 0),
-            df["총 사용 예산"] / df["총 관객수"],
-            np.nan,
-        )
+    new_cols["관객당_비용"] = ratio(budget, visitors, has_visitors)
 
-        # 수입/예산 비율 — 필터링 없이 원본 비율 그대로 보존
-        df["수입_예산_비율"] = np.where(
-            (df["총 사용 예산"].notna()) & (df["총 사용 예산"] > 0),
-            df["총수입"] / df["총 사용 예산"],
-            np.nan,
-        )
+    # 수입/예산 비율 — 필터링 없이 원본 비율 그대로 보존
+    new_cols["수입_예산_비율"] = ratio(col("총수입"), budget, has_budget)
 
-        # 유료 관객 비율
-        df["유료_비율"] = np.where(
-            (df["총 관객수"].notna()) & (df["총 관객수"] > 0),
-            df["유료 관객수"] / df["총 관객수"],
-            np.nan,
-        )
+    # 유료 관객 비율
+    new_cols["유료_비율"] = ratio(col("유료 관객수"), visitors, has_visitors)
 
-        # 프로그램 참여율
-        df["프로그램_참여율"] = np.where(
-            (df["총 관객수"].notna()) & (df["총 관객수"] > 0),
-            df["프로그램 참여 인원"] / df["총 관객수"],
-            np.nan,
-        )
+    # 프로그램 참여율
+    new_cols["프로그램_참여율"] = ratio(col("프로그램 참여 인원"), visitors, has_visitors)
 
-        # 관객당 보도건수 (보도 1건당 관객)
-        df["보도건당_관객"] = np.where(
-            (df["언론 보도 건수"].notna()) & (df["언론 보도 건수"] > 0),
-            df["총 관객수"] / df["언론 보도 건수"],
-            np.nan,
-        )
+    # 관객당 보도건수 (보도 1건당 관객)
+    new_cols["보도건당_관객"] = ratio(visitors, press, press > 0)
 
-    return df
+    # 전시비 비율 (예산 구조)
+    if "전시 사용 예산" in df.columns:
+        new_cols["전시비_비율"] = ratio(col("전시 사용 예산"), budget, has_budget)
+
+    # 운영인력 1인당 관객
+    if "운영 인력_총" in df.columns:
+        staff = col("운영 인력_총")
+        new_cols["인력당_관객"] = ratio(visitors, staff, staff > 0)
+
+    # 매체별 작품 비율 (매체 컬럼 전체를 한 번에 나눔)
+    if "출품 작품 수_총" in df.columns:
+        media = [(f, label) for f, label in MEDIA_FIELDS if f in df.columns]
+        if media:
+            total = col("출품 작품 수_총")[:, None]
+            ratios = ratio(df[[f for f, _ in media]].to_numpy(dtype=float), total, total > 0)
+            for i, (_, label) in enumerate(media):
+                new_cols[f"매체비율_{label}"] = ratios[:, i]
+
+    return df.assign(**new_cols)
 
 
 # ──────────────────────────────────────────────
 # 현재 전시 데이터 → 비교용 dict 변환
 # ──────────────────────────────────────────────
 
+# 숫자 문자열에서 지울 구분자/단위 ("약 1,234명" → "1234")
+_NUMSTRIP_RE = re.compile(r"[,명원%개회]|약\s")
+
+
 def app_data_to_reference_dict(app_data: dict) -> dict:
     """
     Streamlit app의 data dict를 레퍼런스 비교용 flat dict로 변환합니다.
@@ -413,8 +547,7 @@ def app_data_to_reference_dict(app_data: dict) -> dict:
             return None
         if isinstance(s, (int, float)):
             return float(s)
-        s = str(s).replace(",", "").replace("명", "").replace("원", "").replace("%", "")
-        s = s.replace("약 ", "").replace("개", "").replace("회", "").strip()
+        s = _NUMSTRIP_RE.sub("", str(s)).strip()
         try:
             return float(s)
         except (ValueError, TypeError):
@@ -428,6 +561,8 @@ def app_data_to_reference_dict(app_data: dict) -> dict:
     # 관객 수 합산
     ticket = visitor_comp.get("ticket_type", {})
     vtype = visitor_comp.get("visitor_type", {})
+    press = app_data.get("press_coverage", {})
+    programs = app_data.get("related_programs", [])
 
     result = {
         "전시 제목": app_data.get("exhibition_title", ""),
@@ -445,21 +580,12 @@ def app_data_to_reference_dict(app_data: dict) -> dict:
         "예술인패스 관객수": ticket.get("예술인패스", 0),
         "오프닝 참석 인원": vtype.get("오프닝 리셉션", 0),
         "단체 관객수": vtype.get("미술대학 단체", 0) + vtype.get("기타 단체", 0),
-        "언론 보도 건수": (
-            len(app_data.get("press_coverage", {}).get("print_media", []))
-            + len(app_data.get("press_coverage", {}).get("online_media", []))
-        ),
-        "프로그램 총 수": len(app_data.get("related_programs", [])),
+        "언론 보도 건수": len(press.get("print_media", [])) + len(press.get("online_media", [])),
+        "프로그램 총 수": len(programs),
+        # 프로그램 참여 인원 합산 (값이 없으면 None)
+        "프로그램 참여 인원": sum(parse_number(prog.get("participants")) or 0 for prog in programs) or None,
     }
 
-    # 프로그램 참여 인원 합산
-    total_participants = 0
-    for prog in app_data.get("related_programs", []):
-        p = parse_number(prog.get("participants"))
-        if p:
-            total_participants += p
-    result["프로그램 참여 인원"] = total_participants or None
-
     return result
 
 
@@ -480,17 +606,16 @@ def add_exhibition_to_reference(xlsx_path: str, new_data: dict):
     wb = openpyxl.load_workbook(xlsx_path)
     ws = wb.active
 
-    # 컬럼명 → 컬럼 인덱스 매핑 (Row 2)
-    col_map = {}
-    for col_idx in range(1, ws.max_column + 1):
-        header = ws.cell(row=2, column=col_idx).value
-        if header:
-            col_map[str(header).strip()] = col_idx
+    # 컬럼명 → 컬럼 인덱스 매핑 (Row 2) — values_only로 Cell 객체 생성 없이 값만 읽음
+    headers = next(ws.iter_rows(min_row=2, max_row=2, values_only=True), ())
+    col_map = {str(header).strip(): col_idx
+               for col_idx, header in enumerate(headers, start=1) if header}
 
-    # 마지막 데이터 행 찾기
+    # 마지막 데이터 행 찾기 (B열 값이 있는 마지막 행, 중간 빈 행은 건너뜀)
     last_row = 2
-    for row_idx in range(3, ws.max_row + 1):
-        if ws.cell(row=row_idx, column=2).value:
+    for row_idx, (title,) in enumerate(
+            ws.iter_rows(min_row=3, min_col=2, max_col=2, values_only=True), start=3):
+        if title:
             last_row = row_idx
     new_row = last_row + 1
 
@@ -505,13 +630,24 @@ def add_exhibition_to_reference(xlsx_path: str, new_data: dict):
 
     wb.save(xlsx_path)
 
+    # 레퍼런스가 바뀌었으므로 유사도 통계·유형 필터 캐시도 비움
+    _SIM_STATS.clear()
+    _TYPE_VIEWS.clear()
+
+    # 이 파일의 이전 파싱 결과 제거 (키에 mtime이 있어 재사용되지는 않지만 메모리 해제)
+    path = os.path.abspath(xlsx_path)
+    for key in [k for k in _REF_CACHE if k[0] == path]:
+        del _REF_CACHE[key]
+
 
 # ──────────────────────────────────────────────
 # 포맷팅 유틸리티
 # ──────────────────────────────────────────────
 
 def format_number(value, unit: str = "") -> str:
-    """숫자를 읽기 좋은 한국어 형식으로 변환"""
+    """숫자를 읽기 좋은 한국어 형식으로 변환 (배열이면 format_numbers로 일괄 변환)"""
+    if np.ndim(value) > 0:
+        return format_numbers(value, unit)
     if value is None or (isinstance(value, float) and np.isnan(value)):
         return "N/A"
     value = float(value)
@@ -527,6 +663,26 @@ def format_number(value, unit: str = "") -> str:
         return f"{value:.1f}{unit}"
 
 
+# format_numbers 구간별 형식: 억, 만, 천 단위 쉼표, 정수, 소수 1자리 (NaN은 "N/A")
+_NUMBER_FORMATS = ("{:.1f}억", "{:.0f}만", "{:,.0f}", "{:.0f}", "{:.1f}")
+
+
+def format_numbers(values, unit: str = "") -> list[str]:
+    """format_number의 배열 버전 — 구간 판정과 단위 나눗셈을 numpy로 한 번에 처리"""
+    arr = np.asarray(values, dtype=float)  # None → NaN
+    abs_v = np.abs(arr)
+    with np.errstate(invalid="ignore"):
+        bucket = np.select(
+            [np.isnan(arr), abs_v >= 1_0000_0000, abs_v >= 1_0000, abs_v >= 1000, arr == np.trunc(arr)],
+            [-1, 0, 1, 2, 3],
+            default=4,
+        )
+    # + 0.0: -0.0을 0.0으로 바꿔 int() 변환과 같은 "0" 출력
+    scaled = np.select([bucket == 0, bucket == 1], [arr / 1_0000_0000, arr / 1_0000], arr) + 0.0
+    formats = [f + unit for f in _NUMBER_FORMATS]
+    return ["N/A" if b < 0 else formats[b].format(v) for b, v in zip(bucket.tolist(), scaled.tolist())]
+
+
 def format_percent(value) -> str:
     """비율을 퍼센트 문자열로 변환"""
     if value is None or (isinstance(value, float) and np.isnan(value)):
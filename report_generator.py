@@ -8,13 +8,16 @@ v3 보고서 생성기
 from docx import Document
 from docx.shared import Pt, Cm
 from docx.enum.text import WD_ALIGN_PARAGRAPH
+import io
 import os
-import tempfile
+import re
+from collections import defaultdict
+from functools import lru_cache
 
 from styles import (
     setup_document, set_run_font, add_paragraph, add_horizontal_rule,
     add_section_title, add_subsection_title, add_sub2_title,
-    add_detail_title, add_bullet_main, add_bullet_sub, add_arrow_note,
+    add_detail_title, add_bullet_main, add_bullets_bulk, add_bullet_sub, add_arrow_note,
     create_table, create_table_left_aligned,
     add_image, add_images_auto, add_images_2col,
     add_page_break, add_page_numbers_right,
@@ -24,37 +27,143 @@ from chart_generator import (
     create_visitor_pie_chart,
     create_budget_comparison_chart,
     create_visitor_type_chart,
+    chart_thread_pool,
 )
 
 
+# 참여 인원 칸의 첫 번째 인원 수 — "2회", "10월"처럼 횟수·날짜 단위가 붙은 숫자는 건너뜀
+_PARTICIPANTS_NUMBER = re.compile(r"\d[\d,]*(?![\d,]|\s*[회차일시부월년])")
+
+# 홍보 방식 항목 키
+_PROMO_KEYS = ("advertising", "press_release", "web_invitation", "newsletter", "sns", "other")
+
+# 전시 개요 불릿: (키, 라벨, 표시 형식)
+_OVERVIEW_FIELDS = (
+    ("title", "전시 제목", lambda v: f"《{v}》"),
+    ("period", "전시 기간", None),
+    ("exhibition_days", "전시 일수", None),
+    ("artists", "참여 작가", lambda v: ", ".join(v) if isinstance(v, list) else v),
+    ("chief_curator", "책임기획", None),
+    ("curators", "기획", None),
+    ("coordinators", "진행", None),
+    ("curatorial_team", "학예팀", None),
+    ("pr", "홍보", None),
+    ("sponsors", "후원", None),
+)
+
+# 출품 작품 매체 키 → 라벨
+_MEDIA_LABELS = (("painting", "회화"), ("sculpture", "조각"), ("photo", "사진"),
+                 ("installation", "설치"), ("media", "미디어"), ("other", "기타"))
+
+@lru_cache(maxsize=1)
+def _base_document_bytes():
+    """용지·여백·쪽 번호까지 설정한 빈 문서 (.docx 바이트) — 프로세스당 한 번만 만듦"""
+    doc = Document()
+    setup_document(doc)
+    add_page_numbers_right(doc)
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def _new_base_document():
+    """보고서마다 기본 템플릿을 다시 읽고 설정하는 대신 미리 만든 빈 문서를 엶"""
+    return Document(io.BytesIO(_base_document_bytes()))
+
+
+# 관객 후기 분류
+_POSITIVE_REVIEW = frozenset({"긍정", "긍정적"})
+_NEGATIVE_REVIEW = frozenset({"부정", "부정적", "건의", "불만"})
+
+
+# 섹션 인사이트 블록 앞 간격 (예전 빈 문단 높이: 10pt × 1.15줄 + 앞뒤 4pt + 불릿 앞 2pt)
+_INSIGHT_GAP = Pt(22)
+
+
+def _table_rows(items, keys):
+    """dict 리스트 → 표 데이터 행 (없는 키는 빈 문자열)"""
+    return [[d.get(k, "") for k in keys] for d in items]
+
+
 class ExhibitionReportGenerator:
 
+    # 고정 순서로 쓰는 섹션: (메서드 이름, 뒤에 페이지 나눔 여부)
+    # V. 홍보(내용이 있을 때만)와 VI. 평가는 generate에서 이어서 처리
+    _SECTIONS = (
+        ("_create_toc_page", True),
+        ("_section_1_overview", False),
+        ("_section_2_theme", True),
+        ("_section_3_composition", True),
+        ("_section_4_results", False),
+    )
+
     def __init__(self, data):
         self.data = data
-        self.doc = Document()
-        self.temp_files = []
+        self.doc = _new_base_document()
+        self._chart_futures = {}
+        # 이미지 경로 존재 여부는 보고서 1회 생성 동안 경로별로 한 번만 stat
+        self._exists = lru_cache(maxsize=4096)(os.path.exists)
+        # 섹션별 인사이트를 카테고리 라벨로 미리 그룹핑 (보고서 생성 중에는 바뀌지 않음)
+        self._grouped_insights = {}
+        for section_key, insights in (data.get("section_insights") or {}).items():
+            grouped = defaultdict(list)
+            for ins in insights:
+                grouped[ins.get("category_label", ins.get("category", "분석"))].append(ins)
+            self._grouped_insights[section_key] = grouped
+        # 서술형 텍스트는 한 번만 문단/줄 단위로 나눠 둠
+        theme = data.get("theme_text") or ""
+        self._theme_paras = [t for t in (p.strip() for p in theme.split("\n\n")) if t]
+        promo = data.get("promotion") or {}
+        self._promo_lines = {k: [t for t in (l.strip() for l in promo[k].split("\n")) if t]
+                             for k in _PROMO_KEYS if promo.get(k)}
+        # 출품 작품 요약 ("12점 (회화 5점, 설치 7점)") — 작품 수가 없으면 None
+        artworks = data.get("artworks") or {}
+        if artworks.get("total"):
+            media_parts = [f"{label} {artworks[key]}점" for key, label in _MEDIA_LABELS if artworks.get(key)]
+            self._artworks_text = f"{artworks['total']}점" + (f" ({', '.join(media_parts)})" if media_parts else "")
+        else:
+            self._artworks_text = None
+        # 관객 후기를 긍정/부정으로 한 번에 분류
+        self._positive_reviews, self._negative_reviews = [], []
+        for r in data.get("visitor_reviews") or []:
+            category = (r.get("category") or "").strip()
+            if category in _POSITIVE_REVIEW:
+                self._positive_reviews.append(r)
+            elif category in _NEGATIVE_REVIEW:
+                self._negative_reviews.append(r)
 
     def generate(self, output_path):
-        setup_document(self.doc)
-        add_page_numbers_right(self.doc)
+        self._build()
+        self.doc.save(output_path)
+        return output_path
 
-        self._create_toc_page()
-        add_page_break(self.doc)
+    def generate_bytes(self):
+        """보고서를 파일 없이 메모리에서 저장해 .docx 바이트로 반환"""
+        self._build()
+        buf = io.BytesIO()
+        self.doc.save(buf)
+        return buf.getvalue()
 
-        self._section_1_overview()
-        self._section_2_theme()
-        add_page_break(self.doc)
+    def _build(self):
+        # 용지 설정과 쪽 번호는 _new_base_document에 이미 들어 있음
 
-        self._section_3_composition()
-        add_page_break(self.doc)
+        # 차트는 스레드 풀에서 먼저 렌더링 시작 — 앞 섹션 문서 작성과 겹쳐 실행
+        # (shutdown(wait=False)여도 이미 제출한 작업은 끝까지 실행됨)
+        pool = chart_thread_pool()
+        self._chart_futures = self._submit_charts(pool)
+        pool.shutdown(wait=False)
 
-        self._section_4_results()
+        doc = self.doc
+        for name, page_break_after in self._SECTIONS:
+            getattr(self, name)()
+            if page_break_after:
+                add_page_break(doc)
 
         if self._has_promotion_data():
-            add_page_break(self.doc)
+            add_page_break(doc)
             self._section_5_promotion()
 
-        add_page_break(self.doc)
+        add_page_break(doc)
         self._section_6_evaluation()
 
         add_paragraph(self.doc, "")
@@ -62,33 +171,30 @@ class ExhibitionReportGenerator:
                       alignment=WD_ALIGN_PARAGRAPH.LEFT,
                       space_before=Pt(12), space_after=Pt(0), line_spacing=1.15)
 
-        self.doc.save(output_path)
-        self._cleanup()
-        return output_path
-
-    def _cleanup(self):
-        for f in self.temp_files:
-            try: os.remove(f)
-            except OSError: pass
+    def _submit_charts(self, pool):
+        """보고서에 들어갈 차트 렌더링을 미리 제출 → {차트 키: Future(PNG 바이트)}"""
+        futures = {}
+        ticket_type = self.data.get("visitor_composition", {}).get("ticket_type", {})
+        if ticket_type:
+            futures["ticket_type"] = pool.submit(
+                create_visitor_pie_chart, ticket_type, title="입장권별 관객 구성", return_bytes=True)
+        return futures
 
     # ─── 인라인 분석 삽입 헬퍼 ───
 
     def _insert_section_insights(self, section_key):
         """해당 섹션에 배치된 인사이트를 화살표 노트로 삽입"""
-        insights = self.data.get("section_insights", {}).get(section_key, [])
-        if not insights:
+        grouped = self._grouped_insights.get(section_key)
+        if not grouped:
             return
 
-        add_paragraph(self.doc, "", space_before=Pt(4))
-
-        # 카테고리별 그룹핑
-        grouped = {}
-        for ins in insights:
-            label = ins.get("category_label", ins.get("category", "분석"))
-            grouped.setdefault(label, []).append(ins)
-
+        # 빈 문단을 따로 넣지 않고 첫 불릿의 앞 간격으로 대신함
+        # (본문 빈 줄 1줄 + 앞뒤 4pt에 해당하는 간격)
+        space_before = _INSIGHT_GAP
         for label, items in grouped.items():
-            add_bullet_main(self.doc, None, f"[데이터 분석] {label}", bold_value=True)
+            add_bullet_main(self.doc, None, f"[데이터 분석] {label}", bold_value=True,
+                            space_before=space_before)
+            space_before = Pt(2)
             for item in items:
                 add_arrow_note(self.doc, item["text"])
 
@@ -116,7 +222,7 @@ class ExhibitionReportGenerator:
             add_horizontal_rule(self.doc)
 
         poster = self.data.get("poster_image")
-        if poster and os.path.exists(poster):
+        if poster and self._exists(poster):
             add_paragraph(self.doc, "", space_before=Pt(10))
             add_image(self.doc, poster, width=ImageSize.POSTER_WIDTH)
 
@@ -126,23 +232,10 @@ class ExhibitionReportGenerator:
         add_section_title(self.doc, "I", "전시 개요")
         ov = self.data.get("overview", {})
 
-        fields = [
-            ("title", "전시 제목", lambda v: f"《{v}》"),
-            ("period", "전시 기간", None),
-            ("exhibition_days", "전시 일수", None),
-            ("artists", "참여 작가", lambda v: ", ".join(v) if isinstance(v, list) else v),
-            ("chief_curator", "책임기획", None),
-            ("curators", "기획", None),
-            ("coordinators", "진행", None),
-            ("curatorial_team", "학예팀", None),
-            ("pr", "홍보", None),
-            ("sponsors", "후원", None),
-        ]
-        for key, label, fmt in fields:
-            val = ov.get(key)
-            if val:
-                display = fmt(val) if fmt else val
-                add_bullet_main(self.doc, label, display)
+        add_bullets_bulk(self.doc, [
+            (label, fmt(ov[key]) if fmt else ov[key])
+            for key, label, fmt in _OVERVIEW_FIELDS if ov.get(key)
+        ])
 
         # 예산 (굵은 + 밑줄)
         if ov.get("total_budget"):
@@ -162,17 +255,8 @@ class ExhibitionReportGenerator:
                             bold_value=True, underline_value=True)
 
         # 출품 작품 (v3 신규)
-        artworks = self.data.get("artworks", {})
-        if artworks.get("total"):
-            media_parts = []
-            for key, label in [("painting", "회화"), ("sculpture", "조각"), ("photo", "사진"),
-                                ("installation", "설치"), ("media", "미디어"), ("other", "기타")]:
-                v = artworks.get(key, 0)
-                if v: media_parts.append(f"{label} {v}점")
-            overview_text = f"{artworks['total']}점"
-            if media_parts:
-                overview_text += f" ({', '.join(media_parts)})"
-            add_bullet_main(self.doc, "출품 작품", overview_text)
+        if self._artworks_text:
+            add_bullet_main(self.doc, "출품 작품", self._artworks_text)
 
         add_paragraph(self.doc, "")
 
@@ -180,14 +264,10 @@ class ExhibitionReportGenerator:
 
     def _section_2_theme(self):
         add_section_title(self.doc, "II", "전시 주제와 내용")
-        theme = self.data.get("theme_text", "")
-        if theme:
-            for p_text in theme.split("\n\n"):
-                p_text = p_text.strip()
-                if p_text:
-                    add_paragraph(self.doc, p_text, size=Fonts.BODY,
-                                  space_after=Pt(6), line_spacing=1.5,
-                                  first_line_indent=Cm(0.5))
+        for p_text in self._theme_paras:
+            add_paragraph(self.doc, p_text, size=Fonts.BODY,
+                          space_after=Pt(6), line_spacing=1.5,
+                          first_line_indent=Cm(0.5))
 
     # ─── III. 전시 구성 ───
 
@@ -205,29 +285,54 @@ class ExhibitionReportGenerator:
     def _sub_rooms(self):
         add_subsection_title(self.doc, "1", "전시")
         rooms = self.data.get("rooms", [])
+        known_files = self._scan_photo_dirs(rooms)
+        # 반복문 안에서 쓰는 속성은 지역 변수로 한 번만 조회
+        doc, exists = self.doc, self._exists
         for i, room in enumerate(rooms):
-            add_sub2_title(self.doc, i + 1, room.get("name", f"{i+1}전시실"))
+            add_sub2_title(doc, i + 1, room.get("name", f"{i+1}전시실"))
             artists = room.get("artists", "")
             if artists:
                 if isinstance(artists, list): artists = ", ".join(artists)
-                add_detail_title(self.doc, CIRCLED_NUMBERS[0], "참여 작가")
-                add_paragraph(self.doc, artists, size=Fonts.BODY, left_indent=Cm(0.8))
+                add_detail_title(doc, CIRCLED_NUMBERS[0], "참여 작가")
+                add_paragraph(doc, artists, size=Fonts.BODY, left_indent=Cm(0.8))
             fp = room.get("floor_plan")
-            if fp and os.path.exists(fp):
-                add_detail_title(self.doc, CIRCLED_NUMBERS[1], "도면")
-                add_image(self.doc, fp)
+            has_fp = bool(fp) and exists(fp)
+            if has_fp:
+                add_detail_title(doc, CIRCLED_NUMBERS[1], "도면")
+                add_image(doc, fp)
             photos = room.get("photos", [])
-            valid = [p for p in photos if os.path.exists(p)]
+            valid = [p for p in photos if p in known_files or exists(p)]
             if valid:
-                idx = 2 if (fp and os.path.exists(fp)) else 1
-                add_detail_title(self.doc, CIRCLED_NUMBERS[idx], "전경 사진")
-                add_images_auto(self.doc, valid)
+                idx = 2 if has_fp else 1
+                add_detail_title(doc, CIRCLED_NUMBERS[idx], "전경 사진")
+                add_images_auto(doc, valid)
+
+    @staticmethod
+    def _scan_photo_dirs(rooms):
+        """전시 전경 사진이 있는 디렉터리를 한 번씩 scandir → 존재하는 파일 경로 집합
+
+        사진마다 stat하는 대신 디렉터리당 한 번 목록을 읽음. 집합에 없는 경로
+        (표기가 다른 경로 등)는 호출하는 쪽에서 os.path.exists로 다시 확인.
+        """
+        known = set()
+        dirs = {os.path.dirname(p) for room in rooms for p in room.get("photos", [])}
+        for d in dirs:
+            try:
+                with os.scandir(d or ".") as it:
+                    known.update(os.path.join(d, e.name) for e in it if e.is_file())
+            except OSError:
+                pass
+        return known
 
     def _sub_programs(self):
         programs = self.data.get("related_programs", [])
         total_count = len(programs)
-        total_part = sum(int(str(p.get("participants", "0")).replace(",", "").replace("명", ""))
-                         for p in programs if p.get("participants"))
+        # 참여 인원은 자유 입력 — 항목마다 인원 수 하나만 합산 ("1,200명", "30~40명" → 30, "2회 60명" → 60)
+        total_part = 0
+        for p in programs:
+            m = _PARTICIPANTS_NUMBER.search(str(p.get("participants") or ""))
+            if m:
+                total_part += int(m.group().replace(",", ""))
 
         suffix = ""
         if total_count > 0:
@@ -239,8 +344,7 @@ class ExhibitionReportGenerator:
 
         if programs:
             headers = ["구분", "제목", "일자", "참여 인원", "비고"]
-            table_data = [[p.get("category", ""), p.get("title", ""), p.get("date", ""),
-                           p.get("participants", ""), p.get("note", "")] for p in programs]
+            table_data = _table_rows(programs, ("category", "title", "date", "participants", "note"))
             create_table(self.doc, len(table_data), 5, data=table_data, headers=headers,
                          col_widths=[Cm(2), Cm(5.5), Cm(2.5), Cm(1.5), Cm(4)])
 
@@ -263,7 +367,7 @@ class ExhibitionReportGenerator:
         materials = self.data.get("printed_materials", [])
         if materials:
             headers = ["종류", "제작 수량", "비고"]
-            table_data = [[m.get("type", ""), m.get("quantity", ""), m.get("note", "")] for m in materials]
+            table_data = _table_rows(materials, ("type", "quantity", "note"))
             create_table(self.doc, len(table_data), 3, data=table_data, headers=headers,
                          col_widths=[Cm(5.5), Cm(3), Cm(6.5)])
 
@@ -291,8 +395,7 @@ class ExhibitionReportGenerator:
         if summary:
             add_paragraph(self.doc, "", space_before=Pt(6))
             headers = ["사업", "계획 예산(원)", "집행 예산(원)", "계획 대비 집행"]
-            table_data = [[s.get("category", ""), s.get("planned", ""),
-                           s.get("actual", ""), s.get("note", "")] for s in summary]
+            table_data = _table_rows(summary, ("category", "planned", "actual", "note"))
             create_table(self.doc, len(table_data), 4, data=table_data, headers=headers,
                          col_widths=[Cm(2.5), Cm(4.5), Cm(4.5), Cm(4)])
 
@@ -318,9 +421,11 @@ class ExhibitionReportGenerator:
 
         ticket_type = vc.get("ticket_type", {})
         if ticket_type:
-            chart_path = create_visitor_pie_chart(ticket_type, title="입장권별 관객 구성")
-            self.temp_files.append(chart_path)
-            add_image(self.doc, chart_path, is_chart=True)
+            # 임시 파일 없이 PNG 바이트를 바로 문서에 삽입 (generate에서 미리 렌더링한 결과 사용)
+            future = self._chart_futures.get("ticket_type")
+            chart_png = future.result() if future else create_visitor_pie_chart(
+                ticket_type, title="입장권별 관객 구성", return_bytes=True)
+            add_image(self.doc, chart_png, is_chart=True)
 
         for item in vc.get("ticket_analysis", []):
             if item.startswith("→"):
@@ -333,30 +438,25 @@ class ExhibitionReportGenerator:
     # ─── V. 홍보 ───
 
     def _has_promotion_data(self):
-        promo = self.data.get("promotion", {})
-        has_promo = any(promo.get(k, "") for k in ["advertising", "press_release", "web_invitation", "newsletter", "sns", "other"])
-        press = self.data.get("press_coverage", {})
-        has_press = bool(press.get("print_media")) or bool(press.get("online_media"))
-        has_membership = bool(self.data.get("membership", ""))
-        return has_promo or has_press or has_membership
+        # 앞 조건이 참이면 뒤 조건은 평가하지 않음
+        press = self.data.get("press_coverage") or {}
+        return (bool(self._promo_lines)
+                or bool(press.get("print_media")) or bool(press.get("online_media"))
+                or bool(self.data.get("membership")))
 
     def _section_5_promotion(self):
         add_section_title(self.doc, "V", "홍보 방식 및 언론 보도")
 
         # 홍보 방식
         add_subsection_title(self.doc, "1", "홍보 방식")
-        promo = self.data.get("promotion", {})
         num = 1
         for key, label in [("advertising", "광고"), ("press_release", "보도자료"),
                            ("web_invitation", "웹 초청장"), ("newsletter", "뉴스레터"),
                            ("sns", "SNS"), ("other", "그 외")]:
-            content = promo.get(key, "")
-            if content:
+            lines = self._promo_lines.get(key)
+            if lines is not None:
                 add_sub2_title(self.doc, num, label)
-                for line in content.split("\n"):
-                    line = line.strip()
-                    if line:
-                        add_bullet_main(self.doc, None, line)
+                add_bullets_bulk(self.doc, [(None, line) for line in lines])
                 num += 1
 
         # 언론보도
@@ -365,16 +465,14 @@ class ExhibitionReportGenerator:
         if press.get("print_media"):
             add_sub2_title(self.doc, "1", "일간지 및 월간지")
             headers = ["매체명", "일자", "제목", "비고"]
-            table_data = [[i.get("outlet", ""), i.get("date", ""), i.get("title", ""), i.get("note", "")]
-                          for i in press["print_media"]]
+            table_data = _table_rows(press["print_media"], ("outlet", "date", "title", "note"))
             create_table(self.doc, len(table_data), 4, data=table_data, headers=headers,
                          col_widths=[Cm(1.3), Cm(1.3), Cm(9), Cm(4.4)])
 
         if press.get("online_media"):
             add_sub2_title(self.doc, "2", "온라인 매체")
             headers = ["매체명", "일자", "제목", "URL"]
-            table_data = [[i.get("outlet", ""), i.get("date", ""), i.get("title", ""), i.get("url", "")]
-                          for i in press["online_media"]]
+            table_data = _table_rows(press["online_media"], ("outlet", "date", "title", "url"))
             create_table(self.doc, len(table_data), 4, data=table_data, headers=headers,
                          col_widths=[Cm(1.5), Cm(1.5), Cm(7.5), Cm(5.5)])
 
@@ -415,17 +513,14 @@ class ExhibitionReportGenerator:
         add_subsection_title(self.doc, eval_num, "평가")
 
         evaluation = self.data.get("evaluation", {})
-        reviews = self.data.get("visitor_reviews", [])
-        positive_reviews = [r for r in reviews if r.get("category", "").strip() in ("긍정", "긍정적")]
-        negative_reviews = [r for r in reviews if r.get("category", "").strip() in ("부정", "부정적", "건의", "불만")]
+        positive_reviews, negative_reviews = self._positive_reviews, self._negative_reviews
 
         sub_num = 1
 
         positive = evaluation.get("positive", [])
         if positive or positive_reviews:
             add_sub2_title(self.doc, sub_num, "긍정 평가")
-            for item in positive:
-                add_bullet_main(self.doc, None, item)
+            add_bullets_bulk(self.doc, [(None, item) for item in positive])
             if positive_reviews:
                 add_paragraph(self.doc, "", space_before=Pt(4))
                 headers = ["분류", "상세 내용(인용)", "출처"]
@@ -438,8 +533,7 @@ class ExhibitionReportGenerator:
         negative = evaluation.get("negative", [])
         if negative or negative_reviews:
             add_sub2_title(self.doc, sub_num, "부정 평가")
-            for item in negative:
-                add_bullet_main(self.doc, None, item)
+            add_bullets_bulk(self.doc, [(None, item) for item in negative])
             if negative_reviews:
                 add_paragraph(self.doc, "", space_before=Pt(4))
                 headers = ["분류", "상세 내용(인용)", "출처"]
@@ -452,8 +546,7 @@ class ExhibitionReportGenerator:
         improvements = evaluation.get("improvements", [])
         if improvements:
             add_sub2_title(self.doc, sub_num, "개선 방안")
-            for item in improvements:
-                add_bullet_main(self.doc, None, item)
+            add_bullets_bulk(self.doc, [(None, item) for item in improvements])
 
 
 # ──────────────────────────────────────────────
@@ -463,3 +556,8 @@ class ExhibitionReportGenerator:
 def generate_report(data, output_path):
     generator = ExhibitionReportGenerator(data)
     return generator.generate(output_path)
+
+
+def generate_report_bytes(data):
+    """generate_report와 같지만 디스크에 쓰지 않고 .docx 바이트를 반환"""
+    return ExhibitionReportGenerator(data).generate_bytes()
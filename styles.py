@@ -11,8 +11,21 @@ from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.enum.table import WD_TABLE_ALIGNMENT
 from docx.enum.section import WD_ORIENT
 from docx.oxml.ns import qn, nsdecls
-from docx.oxml import parse_xml
+from docx.oxml import parse_xml, OxmlElement
+from lxml import etree
+from docx.document import Document as DocxDocument
+from docx.enum.text import WD_BREAK
+from docx.text.paragraph import Paragraph
+from docx.text.run import Run
+from docx.table import Table
+from docx.oxml.shape import CT_Inline
+from docx.shape import InlineShape
+from xml.sax.saxutils import escape as xml_escape
 import copy
+import re
+import struct
+import weakref
+from functools import lru_cache
 
 
 # ──────────────────────────────────────────────
@@ -83,6 +96,21 @@ def setup_document(doc):
 def set_run_font(run, size=Fonts.BODY, bold=False, italic=False,
                  color=Colors.BLACK, underline=False):
     """Run에 Noto Sans CJK 폰트 적용"""
+    r = run._element
+    if r.rPr is None:
+        # 새 run이면 같은 서식 조합으로 한 번 만들어 둔 <w:rPr>를 복사해 붙임
+        # (속성 setter 7번 대신 노드 하나 삽입)
+        try:
+            template = _run_props(size, bold, italic, color, underline)
+        except TypeError:  # 해시 불가능한 인자
+            template = None
+        if template is not None:
+            r.insert(0, copy.deepcopy(template))
+            return
+    _apply_run_font(run, size, bold, italic, color, underline)
+
+
+def _apply_run_font(run, size, bold, italic, color, underline):
     run.font.size = size
     run.font.bold = bold
     run.font.italic = italic
@@ -93,16 +121,87 @@ def set_run_font(run, size=Fonts.BODY, bold=False, italic=False,
     rpr = run._element.get_or_add_rPr()
     rFonts = rpr.find(qn('w:rFonts'))
     if rFonts is None:
-        rFonts = parse_xml(f'<w:rFonts {nsdecls("w")} w:eastAsia="{Fonts.KR}"/>')
+        rFonts = _xml(f'<w:rFonts {_NS_W} w:eastAsia="{Fonts.KR}"/>')
         rpr.insert(0, rFonts)
     else:
         rFonts.set(qn('w:eastAsia'), Fonts.KR)
 
 
+@lru_cache(maxsize=None)
+def _run_props(size, bold, italic, color, underline):
+    """서식 조합별 <w:rPr> 원본 — 빈 run에 _apply_run_font를 적용한 결과"""
+    run = Run(OxmlElement("w:r"), None)
+    _apply_run_font(run, size, bold, italic, color, underline)
+    return run._element.rPr
+
+
+@lru_cache(maxsize=None)
+def _para_props(alignment, space_before, space_after, line_spacing,
+                first_line_indent, left_indent):
+    """문단 서식 조합별 <w:pPr> 원본 — 빈 문단에 paragraph_format을 적용한 결과"""
+    para = Paragraph(OxmlElement("w:p"), None)
+    para.alignment = alignment
+    pf = para.paragraph_format
+    pf.space_before = space_before
+    pf.space_after = space_after
+    pf.line_spacing = line_spacing
+    if first_line_indent is not None:
+        pf.first_line_indent = first_line_indent
+    if left_indent is not None:
+        pf.left_indent = left_indent
+    return para._p.pPr
+
+
+def _set_para_format(para, alignment=None, space_before=None, space_after=None,
+                     line_spacing=None, first_line_indent=None, left_indent=None):
+    """새 문단에 서식 적용 — 속성을 하나씩 설정하는 대신 캐시된 <w:pPr>를 복사해 붙임"""
+    pPr = _para_props(alignment, space_before, space_after, line_spacing,
+                      first_line_indent, left_indent)
+    if pPr is not None:
+        para._p.insert(0, copy.deepcopy(pPr))
+
+
+_SECT_PR = qn("w:sectPr")
+# XML 조각용 w 네임스페이스 선언 (nsdecls 호출을 매번 반복하지 않도록 미리 만들어 둠)
+_NS_W = nsdecls("w")
+
+
+@lru_cache(maxsize=None)
+def _parsed(xml):
+    """XML 조각 파싱 결과 캐시 — 직접 쓰지 말고 _xml로 복사본을 받을 것"""
+    return parse_xml(xml)
+
+
+def _xml(xml):
+    """고정(또는 색상/크기 조합이 몇 개뿐인) XML 조각 → 새 요소
+
+    매번 문자열을 파싱하는 대신 한 번 파싱한 요소를 deepcopy (약 2배 빠름)
+    """
+    return copy.deepcopy(_parsed(xml))
+
+
 # ──────────────────────────────────────────────
 # 문단 추가 함수들
 # ──────────────────────────────────────────────
 
+def _new_paragraph(doc):
+    """doc.add_paragraph()와 같은 빈 문단을 본문 끝(sectPr 앞)에 추가
+
+    python-docx의 add_paragraph는 매번 본문 자식을 앞에서부터 훑어 sectPr을 찾으므로
+    문단이 많아질수록 느려짐 — 마지막 자식이 sectPr이면 바로 그 앞에 삽입 (O(1))
+    """
+    if not isinstance(doc, DocxDocument):
+        return doc.add_paragraph()
+    body = doc.element.body
+    p = OxmlElement("w:p")
+    last = body[-1] if len(body) else None
+    if last is not None and last.tag == _SECT_PR:
+        last.addprevious(p)
+    else:
+        body._insert_p(p)
+    return Paragraph(p, doc._body)
+
+
 def add_paragraph(doc, text="", size=Fonts.BODY, bold=False,
                   alignment=WD_ALIGN_PARAGRAPH.LEFT,
                   space_before=Pt(0), space_after=Pt(4),
@@ -110,16 +209,9 @@ def add_paragraph(doc, text="", size=Fonts.BODY, bold=False,
                   underline=False, first_line_indent=None,
                   left_indent=None):
     """범용 문단 추가"""
-    para = doc.add_paragraph()
-    para.alignment = alignment
-    pf = para.paragraph_format
-    pf.space_before = space_before
-    pf.space_after = space_after
-    pf.line_spacing = line_spacing
-    if first_line_indent is not None:
-        pf.first_line_indent = first_line_indent
-    if left_indent is not None:
-        pf.left_indent = left_indent
+    para = _new_paragraph(doc)
+    _set_para_format(para, alignment, space_before, space_after, line_spacing,
+                     first_line_indent, left_indent)
 
     if text:
         run = para.add_run(text)
@@ -132,13 +224,12 @@ def add_horizontal_rule(doc, color="AAAAAA", size="3"):
     color: 선 색상 (기본 연한 회색)
     size: 선 두께 (기본 얇은 선, 8분의 1 포인트 단위)
     """
-    para = doc.add_paragraph()
-    para.paragraph_format.space_before = Pt(1)
-    para.paragraph_format.space_after = Pt(1)
+    para = _new_paragraph(doc)
+    _set_para_format(para, space_before=Pt(1), space_after=Pt(1))
     # 문단 하단 테두리로 수평선 구현
     pPr = para._element.get_or_add_pPr()
-    pBdr = parse_xml(
-        f'<w:pBdr {nsdecls("w")}>'
+    pBdr = _xml(
+        f'<w:pBdr {_NS_W}>'
         f'  <w:bottom w:val="single" w:sz="{size}" w:space="1" w:color="{color}"/>'
         f'</w:pBdr>'
     )
@@ -169,12 +260,9 @@ def add_subsection_title(doc, number, title, suffix=""):
     """소제목: 1. 전시 또는 1. 전시 연계 프로그램 - 총 8개 ...
     suffix는 제목 뒤에 붙는 추가 텍스트 (일반 굵기)
     """
-    para = doc.add_paragraph()
-    para.alignment = WD_ALIGN_PARAGRAPH.LEFT
-    pf = para.paragraph_format
-    pf.space_before = Pt(14)
-    pf.space_after = Pt(6)
-    pf.line_spacing = 1.3
+    para = _new_paragraph(doc)
+    _set_para_format(para, WD_ALIGN_PARAGRAPH.LEFT, space_before=Pt(14),
+                     space_after=Pt(6), line_spacing=1.3)
 
     run = para.add_run(f"{number}. {title}")
     set_run_font(run, size=Fonts.SUBSECTION_TITLE, bold=True)
@@ -210,15 +298,12 @@ def add_detail_title(doc, circled_num, title):
 # 불릿 리스트 (● / -)
 # ──────────────────────────────────────────────
 
-def add_bullet_main(doc, label, value, bold_value=False, underline_value=False):
+def add_bullet_main(doc, label, value, bold_value=False, underline_value=False,
+                    space_before=Pt(2)):
     """메인 불릿: ● 전시 제목: 《하이퍼 옐로우》"""
-    para = doc.add_paragraph()
-    para.alignment = WD_ALIGN_PARAGRAPH.LEFT
-    pf = para.paragraph_format
-    pf.space_before = Pt(2)
-    pf.space_after = Pt(2)
-    pf.line_spacing = 1.4
-    pf.left_indent = Cm(0.5)
+    para = _new_paragraph(doc)
+    _set_para_format(para, WD_ALIGN_PARAGRAPH.LEFT, space_before=space_before,
+                     space_after=Pt(2), line_spacing=1.4, left_indent=Cm(0.5))
 
     run_bullet = para.add_run("● ")
     set_run_font(run_bullet, size=Fonts.BULLET_MAIN, bold=True)
@@ -233,6 +318,57 @@ def add_bullet_main(doc, label, value, bold_value=False, underline_value=False):
     return para
 
 
+_XMLNS_ATTR = re.compile(r'\s+xmlns:\w+="[^"]*"')
+
+
+def _fragment(element):
+    """캐시된 요소 → 네임스페이스 선언을 뺀 XML 문자열 (상위 요소의 선언을 공유하도록)"""
+    return _XMLNS_ATTR.sub("", etree.tostring(element, encoding="unicode"))
+
+
+@lru_cache(maxsize=None)
+def _bullet_main_fragments(bold_value, underline_value, space_before):
+    """add_bullet_main 문단의 (pPr, 불릿/라벨 rPr, 값 rPr) XML 문자열"""
+    pPr = _para_props(WD_ALIGN_PARAGRAPH.LEFT, space_before, Pt(2), 1.4, None, Cm(0.5))
+    bold = _run_props(Fonts.BULLET_MAIN, True, False, Colors.BLACK, False)
+    value = _run_props(Fonts.BULLET_MAIN, bold_value, False, Colors.BLACK, underline_value)
+    return _fragment(pPr), _fragment(bold), _fragment(value)
+
+
+def add_bullets_bulk(doc, items, bold_value=False, underline_value=False,
+                     space_before=Pt(2)):
+    """메인 불릿 여러 개를 한 번에 추가: items = [(label, value), ...]
+
+    add_bullet_main을 반복 호출한 것과 같은 문단을 XML 문자열 하나로 만들어
+    한 번 파싱한 뒤 본문 끝(sectPr 앞)에 붙임
+    """
+    items = list(items)
+    if not isinstance(doc, DocxDocument):
+        return [add_bullet_main(doc, label, value, bold_value, underline_value, space_before)
+                for label, value in items]
+    if not items:
+        return []
+
+    pPr, bold_rpr, value_rpr = _bullet_main_fragments(bold_value, underline_value, space_before)
+    bullet = f"<w:r>{bold_rpr}{_run_text_xml('● ')}</w:r>"
+    paras = []
+    for label, value in items:
+        label_run = f"<w:r>{bold_rpr}{_run_text_xml(f'{label}: ')}</w:r>" if label else ""
+        paras.append(f"<w:p>{pPr}{bullet}{label_run}"
+                     f"<w:r>{value_rpr}{_run_text_xml(str(value))}</w:r></w:p>")
+    fragment = parse_xml(f'<w:body {_NS_W}>{"".join(paras)}</w:body>')
+
+    body = doc.element.body
+    ps = list(fragment)
+    last = body[-1] if len(body) else None
+    for p in ps:
+        if last is not None and last.tag == _SECT_PR:
+            last.addprevious(p)
+        else:
+            body._insert_p(p)
+    return [Paragraph(p, doc._body) for p in ps]
+
+
 def add_bullet_sub(doc, text):
     """하위 불릿: - 세부 내용"""
     return add_paragraph(
@@ -263,113 +399,114 @@ def add_arrow_note(doc, text):
 def create_table(doc, rows, cols, data=None, headers=None,
                  col_widths=None, header_bg=True):
     """스타일 표 생성 (회색 헤더 + 검정 테두리)"""
-    total_rows = rows + (1 if headers else 0)
-    table = doc.add_table(rows=total_rows, cols=cols)
-    table.alignment = WD_TABLE_ALIGNMENT.CENTER
-    table.autofit = False
-
-    # 열 너비
-    if col_widths:
-        for i, width in enumerate(col_widths):
-            for row in table.rows:
-                row.cells[i].width = width
-
-    # 테두리
-    _set_table_borders(table)
-
-    # 헤더 행
-    if headers:
-        for i, header_text in enumerate(headers):
-            cell = table.rows[0].cells[i]
-            cell.text = ""
-            para = cell.paragraphs[0]
-            para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            para.paragraph_format.space_before = Pt(2)
-            para.paragraph_format.space_after = Pt(2)
-            run = para.add_run(header_text)
-            set_run_font(run, size=Fonts.TABLE_HEADER, bold=True)
-            if header_bg:
-                _set_cell_bg(cell, Colors.TABLE_HEADER_BG)
-            _set_cell_vertical_center(cell)
-
-    # 데이터
-    if data:
-        start = 1 if headers else 0
-        for r, row_data in enumerate(data):
-            for c, cell_text in enumerate(row_data):
-                cell = table.rows[start + r].cells[c]
-                cell.text = ""
-                para = cell.paragraphs[0]
-                para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                para.paragraph_format.space_before = Pt(2)
-                para.paragraph_format.space_after = Pt(2)
-                run = para.add_run(str(cell_text))
-                set_run_font(run, size=Fonts.TABLE_CELL)
-                _set_cell_vertical_center(cell)
-
-    return table
+    return _build_table(doc, rows, cols, data, headers, col_widths, header_bg)
 
 
 def create_table_left_aligned(doc, rows, cols, data=None, headers=None,
                                col_widths=None, first_col_bold=False):
     """좌측 정렬 표 (첫 열 굵게 옵션)"""
-    table = create_table(doc, rows, cols, data=data, headers=headers,
-                         col_widths=col_widths)
-
-    # 데이터 셀을 좌측 정렬로 변경
-    start = 1 if headers else 0
-    if data:
-        for r, row_data in enumerate(data):
-            for c, _ in enumerate(row_data):
-                cell = table.rows[start + r].cells[c]
-                for para in cell.paragraphs:
-                    if c == 0:
-                        para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                    else:
-                        para.alignment = WD_ALIGN_PARAGRAPH.LEFT
-                    if first_col_bold and c == 0:
-                        for run in para.runs:
-                            run.font.bold = True
-
-    return table
+    return _build_table(doc, rows, cols, data, headers, col_widths, True,
+                        left_aligned=True, first_col_bold=first_col_bold)
 
 
 # ──────────────────────────────────────────────
 # 표 내부 헬퍼
 # ──────────────────────────────────────────────
 
-def _set_cell_bg(cell, hex_color):
-    """셀 배경색"""
-    shading = parse_xml(
-        f'<w:shd {nsdecls("w")} w:fill="{hex_color}" w:val="clear"/>'
-    )
-    cell._element.get_or_add_tcPr().append(shading)
+# 표 XML 템플릿 — python-docx Table API(add_table → cell.text → add_run)가 만드는 것과
+# 같은 구조를 문자열로 한 번에 만들어 parse_xml 1회로 삽입 (셀마다 객체 생성·스키마 탐색 없음)
+_TBL_BORDER = '<w:{side} w:val="single" w:sz="4" w:space="0" w:color="000000"/>'
+_TBL_PR = (
+    '<w:tblPr><w:tblW w:type="auto" w:w="0"/><w:jc w:val="center"/>'
+    '<w:tblLayout w:type="fixed"/>'
+    '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0"'
+    ' w:noHBand="0" w:noVBand="1" w:val="04A0"/>'
+    '<w:tblBorders>'
+    + "".join("  " + _TBL_BORDER.format(side=side)
+              for side in ("top", "left", "bottom", "right", "insideH", "insideV"))
+    + '</w:tblBorders></w:tblPr>'
+)
+_TBL_RPR = (
+    '<w:rPr><w:rFonts w:ascii="{en}" w:hAnsi="{en}" w:eastAsia="{kr}"/>'
+    '<w:b{bold}/><w:i w:val="0"/><w:color w:val="{color}"/><w:sz w:val="{sz}"/>'
+    '<w:u w:val="none"/></w:rPr>'
+)
+# 셀 문단: 빈 run(cell.text = "")과 텍스트 run — jc/굵게/텍스트만 달라짐
+_TBL_P = '<w:p><w:pPr><w:spacing w:before="{space}" w:after="{space}"/><w:jc w:val="{jc}"/></w:pPr>{empty_run}<w:r>{rpr}{text}</w:r></w:p>'
+
+
+@lru_cache(maxsize=1)
+def _table_run_props():
+    """표 run 서식 XML 조각 (헤더, 셀, 굵은 셀) — 모든 표가 공유하므로 한 번만 만듦"""
+    def rpr(size, bold):
+        return _TBL_RPR.format(en=Fonts.EN, kr=Fonts.KR, color=str(Colors.BLACK),
+                               sz=int(Emu(size).pt * 2), bold="" if bold else ' w:val="0"')
+    return rpr(Fonts.TABLE_HEADER, True), rpr(Fonts.TABLE_CELL, False), rpr(Fonts.TABLE_CELL, True)
+
+
+def _run_text_xml(text):
+    """run 텍스트 → <w:t>/<w:tab/>/<w:br/> (python-docx run.text 규칙과 동일)"""
+    parts = []
+    for chunk in re.split(r"([\t\r\n])", text):
+        if chunk == "\t":
+            parts.append("<w:tab/>")
+        elif chunk in ("\r", "\n"):
+            parts.append("<w:br/>")
+        elif chunk:
+            preserve = ' xml:space="preserve"' if len(chunk.strip()) < len(chunk) else ""
+            parts.append(f"<w:t{preserve}>{xml_escape(chunk)}</w:t>")
+    return "".join(parts)
+
+
+def _build_table(doc, rows, cols, data, headers, col_widths, header_bg,
+                 left_aligned=False, first_col_bold=False):
+    """create_table/create_table_left_aligned 공통 — <w:tbl> 하나를 문자열로 만들어 본문에 삽입"""
+    total_rows = rows + (1 if headers else 0)
 
+    # 열 너비: 기본은 본문 폭 균등 분할 (add_table과 같은 계산), col_widths가 있으면 해당 열만 지정
+    grid_w = Emu(doc._block_width // cols).twips if cols else 0
+    cell_ws = [grid_w] * cols
+    for i, width in enumerate(col_widths or ()):
+        cell_ws[i] = Emu(width).twips
 
-def _set_cell_vertical_center(cell):
-    """셀 수직 가운데 정렬"""
-    tc = cell._element
-    tcPr = tc.get_or_add_tcPr()
-    vAlign = parse_xml(f'<w:vAlign {nsdecls("w")} w:val="center"/>')
-    tcPr.append(vAlign)
+    space = Pt(2).twips
+    header_rpr, cell_rpr, cell_bold_rpr = _table_run_props()
+    shd = f'<w:shd w:fill="{Colors.TABLE_HEADER_BG}" w:val="clear"/>' if header_bg else ""
 
+    def cell(c, text, jc, run_rpr, empty_run, extra_pr=""):
+        p = _TBL_P.format(space=space, jc=jc, empty_run=empty_run, rpr=run_rpr,
+                          text=_run_text_xml(text))
+        return (f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{cell_ws[c]}"/>{extra_pr}'
+                f'<w:vAlign w:val="center"/></w:tcPr>{p}</w:tc>')
 
-def _set_table_borders(table, color="000000", size="4"):
-    """표 테두리 (검정)"""
-    tbl = table._tbl
-    tblPr = tbl.tblPr if tbl.tblPr is not None else parse_xml(
-        f'<w:tblPr {nsdecls("w")}/>')
-    borders = parse_xml(
-        f'<w:tblBorders {nsdecls("w")}>'
-        f'  <w:top w:val="single" w:sz="{size}" w:space="0" w:color="{color}"/>'
-        f'  <w:left w:val="single" w:sz="{size}" w:space="0" w:color="{color}"/>'
-        f'  <w:bottom w:val="single" w:sz="{size}" w:space="0" w:color="{color}"/>'
-        f'  <w:right w:val="single" w:sz="{size}" w:space="0" w:color="{color}"/>'
-        f'  <w:insideH w:val="single" w:sz="{size}" w:space="0" w:color="{color}"/>'
-        f'  <w:insideV w:val="single" w:sz="{size}" w:space="0" w:color="{color}"/>'
-        f'</w:tblBorders>'
-    )
-    tblPr.append(borders)
+    def blank(c):
+        return f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{cell_ws[c]}"/></w:tcPr><w:p/></w:tc>'
+
+    row_xml = []
+    if headers:
+        cells = [cell(c, str(h), "center", header_rpr, "<w:r/>", shd) for c, h in enumerate(headers)]
+        cells += [blank(c) for c in range(len(cells), cols)]
+        row_xml.append(cells)
+
+    data = data or []
+    for r in range(rows):
+        row_data = data[r] if r < len(data) else ()
+        cells = []
+        for c, cell_text in enumerate(row_data):
+            if left_aligned and first_col_bold and c == 0:
+                cells.append(cell(c, str(cell_text), "center", cell_bold_rpr, "<w:r><w:rPr><w:b/></w:rPr></w:r>"))
+            else:
+                jc = "left" if left_aligned and c else "center"
+                cells.append(cell(c, str(cell_text), jc, cell_rpr, "<w:r/>"))
+        cells += [blank(c) for c in range(len(cells), cols)]
+        row_xml.append(cells)
+    row_xml += [[blank(c) for c in range(cols)]] * (total_rows - len(row_xml))
+
+    grid = "".join(f'<w:gridCol w:w="{grid_w}"/>' for _ in range(cols))
+    body = "".join(f"<w:tr>{''.join(cells)}</w:tr>" for cells in row_xml)
+    tbl = parse_xml(f'<w:tbl {_NS_W}>{_TBL_PR}<w:tblGrid>{grid}</w:tblGrid>{body}</w:tbl>')
+    doc.element.body._insert_tbl(tbl)
+    return Table(tbl, doc._body)
 
 
 # ──────────────────────────────────────────────
@@ -387,9 +524,70 @@ class ImageSize:
 
 def _get_image_dimensions(image_path):
     """이미지의 원본 가로/세로 비율 반환"""
+    import os
+    if isinstance(image_path, str):
+        # 같은 파일(경로 + 수정 시각 + 크기)이면 다시 열지 않음
+        try:
+            st = os.stat(image_path)
+        except OSError:
+            return None, None
+        return _image_file_dimensions(image_path, st.st_mtime_ns, st.st_size)
+    return _pil_dimensions(image_path)
+
+
+@lru_cache(maxsize=4096)
+def _image_file_dimensions(image_path, mtime_ns, size):
+    """PNG/JPEG는 헤더만 읽어 크기 확인, 그 외 형식은 PIL"""
+    try:
+        with open(image_path, "rb") as f:
+            head = f.read(26)
+            if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+                return struct.unpack(">II", head[16:24])
+            if head.startswith(b"\xff\xd8"):
+                f.seek(2)
+                dims = _jpeg_sof_dimensions(f)
+                if dims is not None:
+                    return dims
+    except OSError:
+        return None, None
+    return _pil_dimensions(image_path)
+
+
+# 크기 정보를 담은 JPEG SOF 마커 (DHT C4, JPG C8, DAC CC 제외)
+_JPEG_SOF = frozenset({0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7,
+                       0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF})
+
+
+def _jpeg_sof_dimensions(f):
+    """JPEG 세그먼트를 건너뛰며 첫 SOF 마커의 (가로, 세로) — 못 찾으면 None"""
+    while True:
+        b = f.read(1)
+        while b and b != b"\xff":
+            b = f.read(1)
+        while b == b"\xff":  # 채움 바이트
+            b = f.read(1)
+        if not b:
+            return None
+        marker = b[0]
+        if marker == 0x01 or 0xD0 <= marker <= 0xD9:  # 길이 없는 마커
+            continue
+        seg = f.read(2)
+        if len(seg) < 2:
+            return None
+        length = struct.unpack(">H", seg)[0]
+        if marker in _JPEG_SOF:
+            data = f.read(5)
+            if len(data) < 5:
+                return None
+            height, width = struct.unpack(">HH", data[1:5])
+            return (width, height) if width and height else None
+        f.seek(length - 2, 1)
+
+
+def _pil_dimensions(image):
     try:
         from PIL import Image as PILImage
-        with PILImage.open(image_path) as img:
+        with PILImage.open(image) as img:
             return img.width, img.height
     except Exception:
         return None, None
@@ -413,11 +611,47 @@ def _calc_constrained_size(image_path, max_width, max_height=None):
     return result_width
 
 
+# 문서 파트별 이미지 캐시: id(part) → {(경로, 수정 시각, 크기): (rId, Image)}
+# python-docx는 같은 이미지를 SHA1로 한 번만 저장하지만, 넣을 때마다 파일을 읽고 해시·헤더 파싱을 반복함
+_PICTURES: dict[int, dict] = {}
+
+
+def _add_picture(run, image, width):
+    """run.add_picture와 같은 결과 — 같은 문서에 이미 넣은 파일 경로면 기존 관계(rId)를 재사용"""
+    import os
+    if not isinstance(image, str):
+        return run.add_picture(image, width=width)
+
+    part = run.part
+    pictures = _PICTURES.get(id(part))
+    if pictures is None:
+        pictures = _PICTURES[id(part)] = {}
+        weakref.finalize(part, _PICTURES.pop, id(part), None)
+    st = os.stat(image)
+    key = (image, st.st_mtime_ns, st.st_size)
+    if key not in pictures:
+        pictures[key] = part.get_or_add_image(image)
+    rId, img = pictures[key]
+
+    # StoryPart.new_pic_inline과 동일한 <wp:inline> 생성
+    cx, cy = img.scaled_dimensions(width, None)
+    inline = CT_Inline.new_pic_inline(part.next_id, rId, img.filename, cx, cy)
+    run._r.add_drawing(inline)
+    return InlineShape(inline)
+
+
 def add_image(doc, image_path, width=None, caption=None, is_chart=False):
-    """이미지 추가 (가운데 정렬, 크기 자동 조절)"""
+    """이미지 추가 (가운데 정렬, 크기 자동 조절)
+
+    image_path는 파일 경로, 이미지 바이트 또는 BytesIO 같은 스트림
+    (차트처럼 메모리에서 바로 넣는 경우 — 임시 파일 없이 add_picture에 그대로 전달)
+    """
+    import io
     import os
-    if not os.path.exists(image_path):
-        return doc.add_paragraph()
+    if isinstance(image_path, bytes):
+        image_path = io.BytesIO(image_path)
+    elif isinstance(image_path, str) and not os.path.exists(image_path):
+        return _new_paragraph(doc)
 
     if width is None:
         if is_chart:
@@ -429,16 +663,15 @@ def add_image(doc, image_path, width=None, caption=None, is_chart=False):
                 ImageSize.SINGLE_MAX_HEIGHT
             )
 
-    para = doc.add_paragraph()
-    para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    para.paragraph_format.space_before = Pt(4)
-    para.paragraph_format.space_after = Pt(4)
+    para = _new_paragraph(doc)
+    _set_para_format(para, WD_ALIGN_PARAGRAPH.CENTER,
+                     space_before=Pt(4), space_after=Pt(4))
     run = para.add_run()
-    run.add_picture(image_path, width=width)
+    _add_picture(run, image_path, width)
 
     if caption:
-        cap = doc.add_paragraph()
-        cap.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        cap = _new_paragraph(doc)
+        _set_para_format(cap, WD_ALIGN_PARAGRAPH.CENTER)
         cap_run = cap.add_run(caption)
         set_run_font(cap_run, size=Fonts.CAPTION, color=Colors.MEDIUM_GRAY, italic=True)
 
@@ -484,19 +717,19 @@ def _add_images_grid(doc, image_paths, img_width):
     # 셀 여백을 최소화하여 이미지가 거의 붙도록 설정
     _set_table_cell_margins(table, top=0, bottom=0, start=28, end=28)
 
+    # 셀 목록을 한 번만 만들어 행 우선 순서로 인덱싱 (table.rows[i].cells[j]는 접근마다 재생성)
+    cells = table._cells
     for idx, img_path in enumerate(image_paths):
         if not os.path.exists(img_path):
             continue
-        row_idx = idx // cols
-        col_idx = idx % cols
-        cell = table.rows[row_idx].cells[col_idx]
+        cell = cells[idx]
         para = cell.paragraphs[0]
         para.alignment = WD_ALIGN_PARAGRAPH.CENTER
         para.paragraph_format.space_before = Pt(1)
         para.paragraph_format.space_after = Pt(1)
         try:
             run = para.add_run()
-            run.add_picture(img_path, width=img_width)
+            _add_picture(run, img_path, img_width)
         except Exception:
             run = para.add_run("[이미지]")
             set_run_font(run, size=Fonts.CAPTION, color=Colors.LIGHT_GRAY)
@@ -507,10 +740,9 @@ def _add_images_grid(doc, image_paths, img_width):
 def _set_table_cell_margins(table, top=0, bottom=0, start=0, end=0):
     """표 전체의 셀 여백 설정 (단위: twips, 1cm = 567twips)"""
     tbl = table._tbl
-    tblPr = tbl.tblPr if tbl.tblPr is not None else parse_xml(
-        f'<w:tblPr {nsdecls("w")}/>')
-    cell_margin = parse_xml(
-        f'<w:tblCellMar {nsdecls("w")}>'
+    tblPr = tbl.tblPr  # add_table로 만든 표에는 항상 있음 (CT_Tbl의 필수 자식)
+    cell_margin = _xml(
+        f'<w:tblCellMar {_NS_W}>'
         f'  <w:top w:w="{top}" w:type="dxa"/>'
         f'  <w:left w:w="{start}" w:type="dxa"/>'
         f'  <w:bottom w:w="{bottom}" w:type="dxa"/>'
@@ -526,13 +758,22 @@ def add_images_2col(doc, image_paths, img_width=Cm(7)):
     return add_images_auto(doc, image_paths)
 
 
+_NO_TC_BORDERS = (
+    f'<w:tcBorders {_NS_W}>'
+    f'  <w:top w:val="none" w:sz="0" w:space="0"/>'
+    f'  <w:left w:val="none" w:sz="0" w:space="0"/>'
+    f'  <w:bottom w:val="none" w:sz="0" w:space="0"/>'
+    f'  <w:right w:val="none" w:sz="0" w:space="0"/>'
+    f'</w:tcBorders>'
+)
+
+
 def _remove_table_borders(table):
     """표 테두리 제거"""
     tbl = table._tbl
-    tblPr = tbl.tblPr if tbl.tblPr is not None else parse_xml(
-        f'<w:tblPr {nsdecls("w")}/>')
-    borders = parse_xml(
-        f'<w:tblBorders {nsdecls("w")}>'
+    tblPr = tbl.tblPr  # add_table로 만든 표에는 항상 있음 (CT_Tbl의 필수 자식)
+    borders = _xml(
+        f'<w:tblBorders {_NS_W}>'
         f'  <w:top w:val="none" w:sz="0" w:space="0"/>'
         f'  <w:left w:val="none" w:sz="0" w:space="0"/>'
         f'  <w:bottom w:val="none" w:sz="0" w:space="0"/>'
@@ -542,20 +783,9 @@ def _remove_table_borders(table):
         f'</w:tblBorders>'
     )
     tblPr.append(borders)
-    # 셀 단위 테두리도 제거
-    for row in table.rows:
-        for cell in row.cells:
-            tc = cell._element
-            tcPr = tc.get_or_add_tcPr()
-            tcBdr = parse_xml(
-                f'<w:tcBorders {nsdecls("w")}>'
-                f'  <w:top w:val="none" w:sz="0" w:space="0"/>'
-                f'  <w:left w:val="none" w:sz="0" w:space="0"/>'
-                f'  <w:bottom w:val="none" w:sz="0" w:space="0"/>'
-                f'  <w:right w:val="none" w:sz="0" w:space="0"/>'
-                f'</w:tcBorders>'
-            )
-            tcPr.append(tcBdr)
+    # 셀 단위 테두리도 제거 (Row/_Cell 객체를 만들지 않고 <w:tc>를 직접 순회)
+    for tc in tbl.iter(qn('w:tc')):
+        tc.get_or_add_tcPr().append(_xml(_NO_TC_BORDERS))
 
 
 # ──────────────────────────────────────────────
@@ -564,7 +794,7 @@ def _remove_table_borders(table):
 
 def add_page_break(doc):
     """페이지 나누기"""
-    doc.add_page_break()
+    _new_paragraph(doc).add_run().add_break(WD_BREAK.PAGE)
 
 
 def add_page_numbers_right(doc):
@@ -575,17 +805,18 @@ def add_page_numbers_right(doc):
     para = footer.paragraphs[0] if footer.paragraphs else footer.add_paragraph()
     para.alignment = WD_ALIGN_PARAGRAPH.RIGHT
 
-    run = para.add_run()
-    fld1 = parse_xml(f'<w:fldChar {nsdecls("w")} w:fldCharType="begin"/>')
-    run._element.append(fld1)
+    # PAGE 필드 run 3개(begin / instrText / end)를 한 번 만든 원본에서 복사해 붙임
+    para._p.extend(copy.deepcopy(list(_page_number_runs())))
 
-    run2 = para.add_run()
-    instr = parse_xml(
-        f'<w:instrText {nsdecls("w")} xml:space="preserve"> PAGE </w:instrText>')
-    run2._element.append(instr)
 
-    run3 = para.add_run()
-    fld2 = parse_xml(f'<w:fldChar {nsdecls("w")} w:fldCharType="end"/>')
-    run3._element.append(fld2)
-
-    set_run_font(run, size=Fonts.PAGE_NUMBER, color=Colors.MEDIUM_GRAY)
+@lru_cache(maxsize=1)
+def _page_number_runs():
+    """페이지 번호 필드 run 원본 — 첫 run에만 글꼴 서식 (기존 add_run 3회 + set_run_font 결과와 동일)"""
+    rpr = _fragment(_run_props(Fonts.PAGE_NUMBER, False, False, Colors.MEDIUM_GRAY, False))
+    return parse_xml(
+        f'<w:p {_NS_W}>'
+        f'<w:r>{rpr}<w:fldChar w:fldCharType="begin"/></w:r>'
+        f'<w:r><w:instrText xml:space="preserve"> PAGE </w:instrText></w:r>'
+        f'<w:r><w:fldChar w:fldCharType="end"/></w:r>'
+        f'</w:p>'
+    )
@@ -1,11 +1,41 @@
 """탭 C: 자동 분석 & 평가 초안"""
 
+from collections import defaultdict
+
+import pandas as pd
 import streamlit as st
 import reference_data as rd
 import analysis_engine as ae
 from utils import collect_analysis_data
 
 
+_INSIGHT_COLUMNS = {
+    "포함": st.column_config.CheckboxColumn("포함", width="small"),
+    "항목": st.column_config.TextColumn("항목", width="medium"),
+    "내용": st.column_config.TextColumn("내용", width="large"),
+}
+
+_EVAL_COLUMNS = {
+    "포함": st.column_config.CheckboxColumn("포함", width="small"),
+    "내용": st.column_config.TextColumn("내용", width="large"),
+}
+
+
+_EVAL_SECTIONS = (
+    ("✅ 긍정 평가", "positive"),
+    ("⚠️ 부정 평가", "negative"),
+    ("💡 개선 방안", "improvement"),
+)
+
+
+def _insight_label(ins):
+    """편집 표의 항목 칸: 아이콘 + 제목 + 순위 배지"""
+    label = f"{ae.CATEGORY_ICONS[ins.category]} {ins.title}"
+    if ins.rank and ins.total_count:
+        label += f"  #{ins.rank}/{ins.total_count}"
+    return label
+
+
 def render(tab, load_reference_data):
     with tab:
         st.markdown('<div class="section-header">🔍 분석 & 평가</div>', unsafe_allow_html=True)
@@ -25,8 +55,9 @@ def render(tab, load_reference_data):
         with col1:
             type_col = "전시 유형"
             if type_col in ref_df.columns and ref_df[type_col].notna().any():
-                valid_types = sorted([t for t in ref_df[type_col].dropna().unique() if int(t) != 0])
-                options = ["전체 (유형 0 제외)"] + [f"{int(t)}유형 ({rd.get_type_count(ref_df, t)}개)" for t in valid_types]
+                type_counts = rd.get_type_counts(ref_df)
+                valid_types = sorted(t for t in type_counts if int(t) != 0)
+                options = ["전체 (유형 0 제외)"] + [f"{int(t)}유형 ({type_counts[t]}개)" for t in valid_types]
                 idx = st.selectbox("비교 대상 유형", range(len(options)),
                                    format_func=lambda i: options[i], key="type_select")
                 exhibition_type = valid_types[idx - 1] if idx > 0 else None
@@ -49,13 +80,12 @@ def render(tab, load_reference_data):
                 st.session_state["analysis_result"] = result
                 st.session_state["insight_selections"] = {}
                 st.session_state["insight_texts"] = {}
-                # 평가 초안 초기화
-                st.session_state["eval_positive_drafts"] = [
-                    d for d in result.eval_drafts if d.eval_type == "positive"]
-                st.session_state["eval_negative_drafts"] = [
-                    d for d in result.eval_drafts if d.eval_type == "negative"]
-                st.session_state["eval_improvement_drafts"] = [
-                    d for d in result.eval_drafts if d.eval_type == "improvement"]
+                # 평가 초안 초기화 (유형별로 한 번에 분류)
+                drafts_by_type = defaultdict(list)
+                for d in result.eval_drafts:
+                    drafts_by_type[d.eval_type].append(d)
+                for _, eval_type in _EVAL_SECTIONS:
+                    st.session_state[f"eval_{eval_type}_drafts"] = drafts_by_type[eval_type]
 
         # ── 결과 표시 ──
         if "analysis_result" not in st.session_state or st.session_state["analysis_result"] is None:
@@ -74,44 +104,43 @@ def render(tab, load_reference_data):
         # ═══════════════════════════════════════
         st.markdown("---")
         st.subheader(f"📊 분석 인사이트 ({len(result.insights)}건)")
-        st.caption("체크박스로 보고서에 포함할 항목을 선택하고, 텍스트를 자유롭게 수정할 수 있습니다. "
-                   "각 인사이트는 보고서의 해당 섹션에 자동 배치됩니다.")
+        st.caption("체크박스로 보고서에 포함할 항목을 선택하고, 내용 칸을 더블클릭해 자유롭게 수정할 수 있습니다. "
+                   "수정 후 '인사이트 저장'을 눌러야 반영되며, 각 인사이트는 보고서의 해당 섹션에 자동 배치됩니다.")
 
         # 섹션별 그룹핑
         by_section = ae.get_insights_by_section(result)
 
-        for section_key in ["results", "composition", "promotion", "evaluation"]:
-            if section_key not in by_section:
-                continue
-
-            section_insights = by_section[section_key]
-            section_label = ae.SECTION_LABELS.get(section_key, section_key)
-
-            with st.expander(f"📌 {section_label}에 배치 ({len(section_insights)}건)", expanded=True):
-                for i, ins in enumerate(section_insights):
-                    key = f"ins_{section_key}_{i}"
-
-                    col_check, col_text = st.columns([0.5, 9.5])
-                    with col_check:
-                        default = ins.priority <= 2
-                        prev = st.session_state["insight_selections"].get(key, default)
-                        selected = st.checkbox("", value=prev, key=f"chk_{key}",
-                                               label_visibility="collapsed")
-                        st.session_state["insight_selections"][key] = selected
-
-                    with col_text:
-                        icon = ae.CATEGORY_ICONS.get(ins.category, "")
-                        badges = []
-                        if ins.rank and ins.total_count:
-                            badges.append(f"#{ins.rank}/{ins.total_count}")
-                        badge_str = " ".join(f"`{b}`" for b in badges)
-
-                        st.markdown(f"{icon} **{ins.title}** {badge_str}")
-
-                        prev_text = st.session_state["insight_texts"].get(key, ins.text)
-                        edited = st.text_area("", value=prev_text, key=f"txt_{key}",
-                                              height=68, label_visibility="collapsed")
-                        st.session_state["insight_texts"][key] = edited
+        # 선택한 섹션의 편집 표만 렌더링 — 다른 섹션의 선택/수정 내용은 session_state에 그대로 유지됨
+        section_keys = [k for k in ae.Section if k in by_section]
+        section_key = st.radio(
+            "배치 섹션", section_keys, horizontal=True, key="insight_section_select",
+            format_func=lambda k: f"{ae.SECTION_LABELS[k]} ({len(by_section[k])}건)")
+
+        section_insights = by_section[section_key]
+        section_label = ae.SECTION_LABELS[section_key]
+
+        # 인사이트마다 체크박스+텍스트 위젯을 두는 대신 섹션당 편집 표 하나로 렌더링
+        keys = [f"ins_{section_key}_{i}" for i in range(len(section_insights))]
+        selections = st.session_state["insight_selections"]
+        texts = st.session_state["insight_texts"]
+        table = pd.DataFrame({
+            "포함": [selections.get(k, ins.priority <= 2)
+                     for k, ins in zip(keys, section_insights)],
+            "항목": [_insight_label(ins) for ins in section_insights],
+            "내용": [texts.get(k, ins.text) for k, ins in zip(keys, section_insights)],
+        })
+
+        # 폼 안의 편집은 '저장'을 누를 때 한 번에 반영 (셀을 고칠 때마다 스크립트가 재실행되지 않음)
+        with st.form("insight_editor", clear_on_submit=False):
+            st.caption(f"📌 {section_label}에 배치 ({len(section_insights)}건)")
+            edited = st.data_editor(
+                table, column_config=_INSIGHT_COLUMNS, disabled=["항목"],
+                hide_index=True, num_rows="fixed", use_container_width=True,
+                key=f"edit_ins_{section_key}")
+            st.form_submit_button("💾 인사이트 저장")
+
+        selections.update(zip(keys, edited["포함"].astype(bool).tolist()))
+        texts.update(zip(keys, edited["내용"].fillna("").astype(str).tolist()))
 
         # ═══════════════════════════════════════
         # PART 2: 유사 전시 비교
@@ -126,44 +155,42 @@ def render(tab, load_reference_data):
         # ═══════════════════════════════════════
         st.markdown("---")
         st.subheader("📝 평가 자동 초안")
-        st.caption("데이터 패턴에서 도출된 평가 문장 초안입니다. 수정하거나 삭제하고, 직접 추가할 수도 있습니다.")
-
-        _render_eval_section("✅ 긍정 평가", "positive",
-                             st.session_state.get("eval_positive_drafts", []),
-                             "eval_positive_custom")
+        st.caption("데이터 패턴에서 도출된 평가 문장 초안입니다. 수정하거나 삭제하고, 직접 추가할 수도 있습니다. "
+                   "초안 수정은 '평가 초안 저장'을 눌러야 반영됩니다.")
 
-        _render_eval_section("⚠️ 부정 평가", "negative",
-                             st.session_state.get("eval_negative_drafts", []),
-                             "eval_negative_custom")
+        with st.form("eval_editor", clear_on_submit=False):
+            for title, eval_type in _EVAL_SECTIONS:
+                _render_eval_drafts(title, eval_type,
+                                    st.session_state.get(f"eval_{eval_type}_drafts", []))
+            st.form_submit_button("💾 평가 초안 저장")
 
-        _render_eval_section("💡 개선 방안", "improvement",
-                             st.session_state.get("eval_improvement_drafts", []),
-                             "eval_improvement_custom")
+        # 직접 추가 항목은 '항목 추가' 버튼이 필요하므로 폼 밖에서 렌더링
+        for title, eval_type in _EVAL_SECTIONS:
+            _render_eval_custom(title, eval_type, f"eval_{eval_type}_custom")
 
 
-def _render_eval_section(title, eval_type, drafts, custom_key):
-    """평가 초안 섹션 렌더링"""
+def _render_eval_drafts(title, eval_type, drafts):
+    """평가 초안 편집 표 렌더링"""
     st.markdown(f"**{title}**")
 
     if not drafts:
         st.caption("자동 생성된 항목이 없습니다.")
     else:
-        for i, draft in enumerate(drafts):
-            key = f"eval_{eval_type}_{i}"
-            col_check, col_text = st.columns([0.5, 9.5])
-            with col_check:
-                prev = getattr(draft, 'selected', True)
-                selected = st.checkbox("", value=prev, key=f"echk_{key}",
-                                       label_visibility="collapsed")
-                drafts[i].selected = selected
-            with col_text:
-                st.markdown(f'<div class="eval-draft">{draft.text}</div>', unsafe_allow_html=True)
-                edited = st.text_area("", value=draft.text, key=f"etxt_{key}",
-                                      height=60, label_visibility="collapsed")
-                drafts[i].text = edited
-
-    # 사용자 직접 추가
-    st.caption("직접 추가:")
+        table = pd.DataFrame({
+            "포함": [getattr(d, "selected", True) for d in drafts],
+            "내용": [d.text for d in drafts],
+        })
+        edited = st.data_editor(
+            table, column_config=_EVAL_COLUMNS, hide_index=True, num_rows="fixed",
+            use_container_width=True, key=f"edit_eval_{eval_type}")
+        for draft, selected, text in zip(drafts, edited["포함"], edited["내용"]):
+            draft.selected = bool(selected)
+            draft.text = "" if pd.isna(text) else str(text)
+
+
+def _render_eval_custom(title, eval_type, custom_key):
+    """사용자 직접 추가 항목 렌더링"""
+    st.caption(f"{title} 직접 추가:")
     if custom_key not in st.session_state:
         st.session_state[custom_key] = [""]
     for i, txt in enumerate(st.session_state[custom_key]):
@@ -171,6 +198,10 @@ def _render_eval_section(title, eval_type, drafts, custom_key):
             f"추가 {i+1}", value=txt, key=f"custom_{eval_type}_{i}",
             label_visibility="collapsed")
 
-    if st.button(f"➕ 항목 추가", key=f"add_custom_{eval_type}"):
-        st.session_state[custom_key].append("")
-        st.rerun()
+    # 콜백에서 빈 항목을 붙이면 버튼이 일으키는 재실행 한 번에 반영됨
+    st.button(f"➕ 항목 추가", key=f"add_custom_{eval_type}",
+              on_click=_add_custom, args=(custom_key,))
+
+
+def _add_custom(custom_key):
+    st.session_state[custom_key].append("")
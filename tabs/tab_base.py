@@ -1,14 +1,19 @@
 """탭 B: 기반 정보 — 전시의 서술적 정보 입력"""
 
+import os
+
+import pandas as pd
 import streamlit as st
 from datetime import date
-from utils import add_item, remove_item
+from utils import (add_item, remove_item, fragment, exhibition_days, save_upload_streamed,
+                   discard_uploads)
 
 
 def render(tab):
     with tab:
         st.markdown('<div class="section-header">📋 기반 정보</div>', unsafe_allow_html=True)
-        st.caption("보고서의 뼈대가 되는 서술 정보를 입력합니다. 숫자는 다음 탭에서 입력합니다.")
+        st.caption("보고서의 뼈대가 되는 서술 정보를 입력합니다. 숫자는 다음 탭에서 입력합니다. "
+                   "전시실·프로그램·인쇄물·언론보도·후기 목록은 각 '저장' 버튼을 누르면 반영됩니다.")
 
         # ── 전시 기본 ──
         st.subheader("전시 기본")
@@ -22,8 +27,8 @@ def render(tab):
             st.date_input("전시 종료일", key="period_end", value=None)
 
         # 자동 전시 일수 표시
-        if st.session_state.period_start and st.session_state.period_end:
-            days = (st.session_state.period_end - st.session_state.period_start).days + 1
+        days = exhibition_days()
+        if days is not None:
             st.info(f"📅 전시 일수: **{days}일**")
 
         st.divider()
@@ -54,211 +59,311 @@ def render(tab):
         st.divider()
 
         # ── 전시실 구성 ──
-        st.subheader("전시실 구성")
-        for i, room in enumerate(st.session_state.rooms):
-            with st.expander(f"🏛️ {room.get('name', f'{i+1}전시실')}", expanded=(i == 0)):
-                c1, c2 = st.columns([1, 2])
-                with c1:
-                    st.session_state.rooms[i]["name"] = st.text_input(
-                        "전시실명", value=room.get("name", ""), key=f"room_name_{i}")
-                with c2:
-                    st.session_state.rooms[i]["artists"] = st.text_input(
-                        "참여 작가", value=room.get("artists", ""), key=f"room_artists_{i}")
-
-                st.session_state.rooms[i]["floor_plan_file"] = st.file_uploader(
-                    "도면 이미지", type=["png", "jpg", "jpeg"], key=f"room_floor_{i}")
-                st.session_state.rooms[i]["photo_files"] = st.file_uploader(
-                    "전경 사진", type=["png", "jpg", "jpeg"], accept_multiple_files=True, key=f"room_photos_{i}")
-
-        col_add, col_rm = st.columns(2)
-        with col_add:
-            if st.button("➕ 전시실 추가", key="add_room"):
-                n = len(st.session_state.rooms) + 1
-                add_item("rooms", {"name": f"{n}전시실", "artists": ""})
-                st.rerun()
-        with col_rm:
-            if st.button("➖ 마지막 전시실 제거", key="rm_room"):
-                remove_item("rooms", -1)
-                st.rerun()
+        _render_rooms()
 
         st.divider()
 
         # ── 프로그램 (서술 정보) ──
-        st.subheader("전시 연계 프로그램")
-        st.caption("프로그램 총 수와 참여 인원 합계는 '정량 데이터' 탭에서 입력합니다.")
-        for i, prog in enumerate(st.session_state.related_programs):
-            cols = st.columns([1.5, 3, 2, 1.5, 2.5])
-            with cols[0]:
-                cat_options = ["아티스트 토크", "강연", "워크숍", "스크리닝", "퍼포먼스", "기타"]
-                cat_val = prog.get("category")
-                cat_idx = cat_options.index(cat_val) if cat_val in cat_options else None
-                st.session_state.related_programs[i]["category"] = st.selectbox(
-                    "구분", options=cat_options, index=cat_idx, key=f"prog_cat_{i}",
-                    placeholder="선택")
-            with cols[1]:
-                st.session_state.related_programs[i]["title"] = st.text_input(
-                    "제목", value=prog.get("title", ""), key=f"prog_title_{i}")
-            with cols[2]:
-                date_val = prog.get("date")
-                if not isinstance(date_val, date):
-                    date_val = None
-                st.session_state.related_programs[i]["date"] = st.date_input(
-                    "일자", value=date_val, key=f"prog_date_{i}")
-            with cols[3]:
-                st.session_state.related_programs[i]["participants"] = st.text_input(
-                    "참여 인원", value=prog.get("participants", ""), key=f"prog_part_{i}")
-            with cols[4]:
-                st.session_state.related_programs[i]["note"] = st.text_input(
-                    "비고", value=prog.get("note", ""), key=f"prog_note_{i}")
-
-        c1, c2 = st.columns(2)
-        with c1:
-            if st.button("➕ 프로그램 추가", key="add_prog"):
-                add_item("related_programs", {"category": None, "title": "", "date": None, "participants": "", "note": ""})
-                st.rerun()
-        with c2:
-            if st.button("➖ 마지막 프로그램 제거", key="rm_prog"):
-                remove_item("related_programs", -1)
-                st.rerun()
+        _render_programs()
 
         st.divider()
 
         # ── 인쇄물 ──
-        st.subheader("인쇄물 및 굿즈")
-        for i, mat in enumerate(st.session_state.printed_materials):
-            cols = st.columns([3, 2, 4])
-            with cols[0]:
-                mat_options = ["포스터", "리플렛", "초대장", "굿즈", "기타"]
-                mat_val = mat.get("type")
-                mat_idx = mat_options.index(mat_val) if mat_val in mat_options else None
-                st.session_state.printed_materials[i]["type"] = st.selectbox(
-                    "종류", options=mat_options, index=mat_idx, key=f"mat_type_{i}",
-                    placeholder="선택")
-            with cols[1]:
-                st.session_state.printed_materials[i]["quantity"] = st.text_input(
-                    "수량", value=mat.get("quantity", ""), key=f"mat_qty_{i}")
-            with cols[2]:
-                st.session_state.printed_materials[i]["note"] = st.text_input(
-                    "비고", value=mat.get("note", ""), key=f"mat_note_{i}")
-
-        c1, c2 = st.columns(2)
-        with c1:
-            if st.button("➕ 인쇄물 추가", key="add_mat"):
-                add_item("printed_materials", {"type": None, "quantity": "", "note": ""})
-                st.rerun()
-        with c2:
-            if st.button("➖ 마지막 인쇄물 제거", key="rm_mat"):
-                remove_item("printed_materials", -1)
-                st.rerun()
+        _render_materials()
 
         st.divider()
 
         # ── 홍보 방식 ──
-        st.subheader("홍보 방식")
-        st.text_area("광고", key="promo_advertising", height=80)
-        st.text_area("보도자료", key="promo_press_release", height=80)
-        c1, c2 = st.columns(2)
-        with c1:
-            st.text_area("웹 초청장", key="promo_web_invitation", height=80)
-            st.text_area("뉴스레터", key="promo_newsletter", height=80)
-        with c2:
-            st.text_area("SNS", key="promo_sns", height=80)
-            st.text_area("그 외", key="promo_other", height=80)
+        _render_promo()
 
         st.divider()
 
         # ── 언론보도 리스트 ──
-        st.subheader("언론보도 리스트")
-        st.caption("보도 총 건수는 '정량 데이터' 탭에서 자동 집계됩니다.")
-
-        st.markdown("**일간지 및 월간지**")
-        for i, item in enumerate(st.session_state.press_print):
-            cols = st.columns([1.5, 1.5, 5, 2])
-            with cols[0]:
-                st.session_state.press_print[i]["outlet"] = st.text_input(
-                    "매체명", value=item.get("outlet", ""), key=f"pp_outlet_{i}")
-            with cols[1]:
-                pp_date_val = item.get("date")
-                if not isinstance(pp_date_val, date):
-                    pp_date_val = None
-                st.session_state.press_print[i]["date"] = st.date_input(
-                    "일자", value=pp_date_val, key=f"pp_date_{i}")
-            with cols[2]:
-                st.session_state.press_print[i]["title"] = st.text_input(
-                    "제목", value=item.get("title", ""), key=f"pp_title_{i}")
-            with cols[3]:
-                st.session_state.press_print[i]["note"] = st.text_input(
-                    "비고", value=item.get("note", ""), key=f"pp_note_{i}")
-
-        c1, c2 = st.columns(2)
-        with c1:
-            if st.button("➕ 일간지 추가", key="add_pp"):
-                add_item("press_print", {"outlet": "", "date": None, "title": "", "note": ""})
-                st.rerun()
-        with c2:
-            if st.button("➖ 마지막 일간지 제거", key="rm_pp"):
-                remove_item("press_print", -1)
-                st.rerun()
-
-        st.markdown("**온라인 매체**")
-        for i, item in enumerate(st.session_state.press_online):
-            cols = st.columns([1.5, 1.5, 4, 3])
-            with cols[0]:
-                st.session_state.press_online[i]["outlet"] = st.text_input(
-                    "매체명", value=item.get("outlet", ""), key=f"po_outlet_{i}")
-            with cols[1]:
-                po_date_val = item.get("date")
-                if not isinstance(po_date_val, date):
-                    po_date_val = None
-                st.session_state.press_online[i]["date"] = st.date_input(
-                    "일자", value=po_date_val, key=f"po_date_{i}")
-            with cols[2]:
-                st.session_state.press_online[i]["title"] = st.text_input(
-                    "제목", value=item.get("title", ""), key=f"po_title_{i}")
-            with cols[3]:
-                st.session_state.press_online[i]["url"] = st.text_input(
-                    "URL", value=item.get("url", ""), key=f"po_url_{i}")
-
-        c1, c2 = st.columns(2)
-        with c1:
-            if st.button("➕ 온라인 매체 추가", key="add_po"):
-                add_item("press_online", {"outlet": "", "date": None, "title": "", "url": ""})
-                st.rerun()
-        with c2:
-            if st.button("➖ 마지막 온라인 매체 제거", key="rm_po"):
-                remove_item("press_online", -1)
-                st.rerun()
+        _render_press()
 
         st.divider()
 
         # ── 멤버십 ──
-        st.subheader("멤버십 커뮤니케이션")
-        st.text_area("멤버십 관련 내용", key="membership_text", height=100)
+        _render_membership()
 
         st.divider()
 
         # ── 관객 후기 ──
-        st.subheader("관객 후기")
-        for i, review in enumerate(st.session_state.visitor_reviews):
-            cols = st.columns([1.5, 6, 2])
-            with cols[0]:
-                st.session_state.visitor_reviews[i]["category"] = st.selectbox(
-                    "분류", ["긍정", "부정", "건의"], key=f"rev_cat_{i}",
-                    index=["긍정", "부정", "건의"].index(review.get("category", "긍정"))
-                    if review.get("category", "긍정") in ["긍정", "부정", "건의"] else 0)
-            with cols[1]:
-                st.session_state.visitor_reviews[i]["content"] = st.text_input(
-                    "내용", value=review.get("content", ""), key=f"rev_content_{i}")
-            with cols[2]:
-                st.session_state.visitor_reviews[i]["source"] = st.text_input(
-                    "출처", value=review.get("source", ""), key=f"rev_source_{i}")
-
-        c1, c2 = st.columns(2)
-        with c1:
-            if st.button("➕ 후기 추가", key="add_rev"):
-                add_item("visitor_reviews", {"category": "긍정", "content": "", "source": ""})
-                st.rerun()
-        with c2:
-            if st.button("➖ 마지막 후기 제거", key="rm_rev"):
-                remove_item("visitor_reviews", -1)
-                st.rerun()
+        _render_reviews()
+
+
+# ──────────────────────────────────────────────
+# 목록 입력
+# 전시실은 항목마다 파일 업로드가 있어 위젯을 key로만 바인딩하고(value= 없이),
+# 처음 렌더링할 때 항목 값으로 키를 채운 뒤 폼 저장 시 항목 딕셔너리로 옮김.
+# 나머지 목록은 행마다 위젯을 만드는 대신 편집 표(st.data_editor) 하나로 입력
+# ──────────────────────────────────────────────
+
+PROGRAM_CATEGORIES = ("아티스트 토크", "강연", "워크숍", "스크리닝", "퍼포먼스", "기타")
+MATERIAL_TYPES = ("포스터", "리플렛", "초대장", "굿즈", "기타")
+REVIEW_CATEGORIES = ("긍정", "부정", "건의")
+
+
+def _text(v):
+    return "" if v is None else v
+
+
+def _date_or_none(v):
+    """편집 표의 날짜 칸 — 빈 열에서 입력하면 ISO 문자열로 들어오기도 함"""
+    if isinstance(v, str):
+        try:
+            return date.fromisoformat(v[:10])
+        except ValueError:
+            return None
+    return v if isinstance(v, date) else None
+
+
+def _option_or(options, default=None):
+    valid = frozenset(options)  # 행마다 목록을 훑지 않도록 집합으로 한 번만 만듦
+    return lambda v: v if v in valid else default
+
+
+# 전시실: 항목 필드 → (위젯 키 접두어, 값 정규화)
+ROOM_WIDGET_FIELDS = (("name", "room_name", _text), ("artists", "room_artists", _text))
+
+# 전시실 업로드: (항목 필드, 업로더 키 접두어, 라벨, 여러 파일 여부)
+ROOM_UPLOAD_FIELDS = (("floor_plan", "room_floor", "도면 이미지", False),
+                      ("photos", "room_photos", "전경 사진", True))
+
+# 편집 표 목록: 목록 키 → ((항목 필드, 열 설정, 값 정규화), ...)
+LIST_TABLE_COLUMNS = {
+    "related_programs": (
+        ("category", st.column_config.SelectboxColumn("구분", options=PROGRAM_CATEGORIES),
+         _option_or(PROGRAM_CATEGORIES)),
+        ("title", st.column_config.TextColumn("제목", width="large"), _text),
+        ("date", st.column_config.DateColumn("일자", format="YYYY.MM.DD"), _date_or_none),
+        ("participants", st.column_config.TextColumn("참여 인원"), _text),
+        ("note", st.column_config.TextColumn("비고"), _text),
+    ),
+    "printed_materials": (
+        ("type", st.column_config.SelectboxColumn("종류", options=MATERIAL_TYPES),
+         _option_or(MATERIAL_TYPES)),
+        ("quantity", st.column_config.TextColumn("수량"), _text),
+        ("note", st.column_config.TextColumn("비고", width="large"), _text),
+    ),
+    "press_print": (
+        ("outlet", st.column_config.TextColumn("매체명"), _text),
+        ("date", st.column_config.DateColumn("일자", format="YYYY.MM.DD"), _date_or_none),
+        ("title", st.column_config.TextColumn("제목", width="large"), _text),
+        ("note", st.column_config.TextColumn("비고"), _text),
+    ),
+    "press_online": (
+        ("outlet", st.column_config.TextColumn("매체명"), _text),
+        ("date", st.column_config.DateColumn("일자", format="YYYY.MM.DD"), _date_or_none),
+        ("title", st.column_config.TextColumn("제목", width="large"), _text),
+        ("url", st.column_config.TextColumn("URL"), _text),
+    ),
+    "visitor_reviews": (
+        ("category", st.column_config.SelectboxColumn("분류", options=REVIEW_CATEGORIES, default="긍정"),
+         _option_or(REVIEW_CATEGORIES, "긍정")),
+        ("content", st.column_config.TextColumn("내용", width="large"), _text),
+        ("source", st.column_config.TextColumn("출처"), _text),
+    ),
+}
+
+# JSON 저장에서 제외하고 JSON 로드 시 비울 위젯 키 접두어 (항목 딕셔너리가 원본)
+LIST_WIDGET_PREFIXES = (tuple(f"{prefix}_" for _, prefix, _ in ROOM_WIDGET_FIELDS)
+                        + tuple(f"edit_{list_key}" for list_key in LIST_TABLE_COLUMNS))
+
+
+def _seed_room_widgets():
+    """아직 위젯 상태가 없는 전시실 키만 항목 값으로 채움"""
+    s = st.session_state
+    for i, room in enumerate(s.rooms):
+        for field, prefix, normalize in ROOM_WIDGET_FIELDS:
+            key = f"{prefix}_{i}"
+            if key not in s:
+                s[key] = normalize(room.get(field))
+
+
+def _sync_room_widgets():
+    """위젯 값 → 전시실 딕셔너리 (폼 저장 시 한 번)"""
+    s = st.session_state
+    for i, room in enumerate(s.rooms):
+        for field, prefix, _ in ROOM_WIDGET_FIELDS:
+            room[field] = s[f"{prefix}_{i}"]
+
+
+def _room_upload(room, i, field, prefix, label, multiple):
+    """전시실 업로드 — 파일은 바로 세션 임시 디렉터리에 쓰고 항목에는 경로만 저장
+
+    업로더가 비어 있어도 저장된 경로는 유지하고, 이 업로더로 올렸던 파일을
+    사용자가 지웠을 때만 비움. 바뀌거나 지워진 이전 파일은 디스크에서 삭제.
+    """
+    s = st.session_state
+    key = f"{prefix}_{i}"
+    seen_key = f"_{prefix}_seen_{i}"  # 지금 업로더에 파일이 올라가 있는지
+    if key not in s:
+        # 업로더가 새로 만들어짐(첫 렌더링·전시실 추가·다른 탭에서 돌아옴 등) — 비어 있어도 삭제가 아님
+        s[seen_key] = False
+
+    uploaded = st.file_uploader(label, type=["png", "jpg", "jpeg"],
+                                accept_multiple_files=multiple, key=key)
+    files = (uploaded or []) if multiple else ([uploaded] if uploaded else [])
+    old = room.get(field)
+    if files:
+        paths = [save_upload_streamed(f, f"room{i}_{field}") for f in files]
+        new = paths if multiple else paths[0]
+        s[seen_key] = True
+    elif s.get(seen_key):
+        new = [] if multiple else None
+        s[seen_key] = False
+    else:
+        # 업로더 상태는 탭을 오가면 사라지므로, 항목에 남아 있는 파일을 따로 표시
+        kept = (old or []) if multiple else [old] if old else []
+        if kept:
+            st.caption("저장된 파일: " + ", ".join(os.path.basename(p) for p in kept))
+        return
+    if new != old:
+        old_paths = set(old or []) if multiple else {old}
+        discard_uploads(old_paths - set(new if multiple else [new]))
+        room[field] = new
+
+
+def _add_room():
+    n = len(st.session_state.rooms) + 1
+    add_item("rooms", {"name": f"{n}전시실", "artists": ""})
+
+
+def _remove_last_room():
+    """마지막 전시실 제거 — 같은 번호로 다시 추가할 때 이전 값이 남지 않도록 위젯 키도 비움"""
+    s = st.session_state
+    last = len(s.rooms) - 1
+    removed = s.rooms[-1]
+    remove_item("rooms", -1)
+    if len(s.rooms) == last:
+        for _, prefix, _ in ROOM_WIDGET_FIELDS:
+            s.pop(f"{prefix}_{last}", None)
+        for _, prefix, _, _ in ROOM_UPLOAD_FIELDS:
+            s.pop(f"_{prefix}_seen_{last}", None)
+        discard_uploads([removed.get("floor_plan"), *(removed.get("photos") or [])])
+
+
+def normalize_list_items(list_key, items):
+    """목록 항목을 편집 표 열 형식으로 정규화 (JSON 로드·표 저장 시 한 번)
+
+    항목 값은 들어올 때 정규화해 두므로 렌더링할 때는 그대로 표에 넣음.
+    """
+    columns = LIST_TABLE_COLUMNS[list_key]
+    return [{**item, **{field: normalize(item.get(field)) for field, _, normalize in columns}}
+            for item in items if isinstance(item, dict)]
+
+
+def _render_list_table(list_key, form_key, submit_label):
+    """목록 편집 표 — 행 추가/삭제까지 표 안에서 하고 저장 시 항목 딕셔너리 목록으로 교체
+
+    Returns:
+        저장 버튼을 눌렀으면 True
+    """
+    columns = LIST_TABLE_COLUMNS[list_key]
+    fields = [field for field, _, _ in columns]
+    table = pd.DataFrame(
+        [[item.get(field) for field in fields] for item in st.session_state[list_key]],
+        columns=fields, dtype=object)
+
+    with st.form(form_key):
+        edited = st.data_editor(
+            table, column_config={field: config for field, config, _ in columns},
+            num_rows="dynamic", hide_index=True, use_container_width=True,
+            key=f"edit_{list_key}")
+        submitted = st.form_submit_button(submit_label)
+
+    if submitted:
+        st.session_state[list_key] = [
+            {field: normalize(None if pd.isna(value) else value)
+             for (field, _, normalize), value in zip(columns, row)}
+            for row in edited.itertuples(index=False, name=None)
+        ]
+    return submitted
+
+
+@fragment
+def _render_rooms():
+    """전시실 구성 (이 섹션의 위젯만 다시 실행)"""
+    st.subheader("전시실 구성")
+    _seed_room_widgets()
+    with st.form("rooms_form"):
+        for i, room in enumerate(st.session_state.rooms):
+            with st.expander(f"🏛️ {room.get('name', f'{i+1}전시실')}", expanded=(i == 0)):
+                c1, c2 = st.columns([1, 2])
+                with c1:
+                    st.text_input("전시실명", key=f"room_name_{i}")
+                with c2:
+                    st.text_input("참여 작가", key=f"room_artists_{i}")
+
+                for field, prefix, label, multiple in ROOM_UPLOAD_FIELDS:
+                    _room_upload(room, i, field, prefix, label, multiple)
+        if st.form_submit_button("💾 전시실 저장"):
+            _sync_room_widgets()
+
+    # 콜백에서 목록을 바꾸면 버튼이 일으키는 재실행 한 번에 반영됨
+    col_add, col_rm = st.columns(2)
+    with col_add:
+        st.button("➕ 전시실 추가", key="add_room", on_click=_add_room)
+    with col_rm:
+        st.button("➖ 마지막 전시실 제거", key="rm_room", on_click=_remove_last_room)
+
+
+@fragment
+def _render_programs():
+    """전시 연계 프로그램 (이 섹션의 위젯만 다시 실행)"""
+    st.subheader("전시 연계 프로그램")
+    st.caption("프로그램 총 수와 참여 인원 합계는 '정량 데이터' 탭에서 입력합니다.")
+    _render_list_table("related_programs", "programs_form", "💾 프로그램 저장")
+
+
+@fragment
+def _render_materials():
+    """인쇄물 및 굿즈 (이 섹션의 위젯만 다시 실행)"""
+    st.subheader("인쇄물 및 굿즈")
+    _render_list_table("printed_materials", "materials_form", "💾 인쇄물 저장")
+
+
+@fragment
+def _render_promo():
+    """홍보 방식 (이 섹션의 위젯만 다시 실행 — 값은 보고서 생성 시에만 읽음)"""
+    st.subheader("홍보 방식")
+    st.text_area("광고", key="promo_advertising", height=80)
+    st.text_area("보도자료", key="promo_press_release", height=80)
+    c1, c2 = st.columns(2)
+    with c1:
+        st.text_area("웹 초청장", key="promo_web_invitation", height=80)
+        st.text_area("뉴스레터", key="promo_newsletter", height=80)
+    with c2:
+        st.text_area("SNS", key="promo_sns", height=80)
+        st.text_area("그 외", key="promo_other", height=80)
+
+
+@fragment
+def _render_press():
+    """언론보도 리스트 (이 섹션의 위젯만 다시 실행)"""
+    st.subheader("언론보도 리스트")
+    st.caption("보도 총 건수는 '정량 데이터' 탭에서 자동 집계됩니다.")
+
+    # 저장하면 보도 건수 동기화 제안('정량 데이터' 탭)에 반영되도록 전체 재실행
+    st.markdown("**일간지 및 월간지**")
+    if _render_list_table("press_print", "press_print_form", "💾 일간지 저장"):
+        st.rerun()
+
+    st.markdown("**온라인 매체**")
+    if _render_list_table("press_online", "press_online_form", "💾 온라인 매체 저장"):
+        st.rerun()
+
+
+@fragment
+def _render_membership():
+    """멤버십 커뮤니케이션 (이 섹션의 위젯만 다시 실행)"""
+    st.subheader("멤버십 커뮤니케이션")
+    st.text_area("멤버십 관련 내용", key="membership_text", height=100)
+
+
+@fragment
+def _render_reviews():
+    """관객 후기 (이 섹션의 위젯만 다시 실행)"""
+    st.subheader("관객 후기")
+    _render_list_table("visitor_reviews", "reviews_form", "💾 후기 저장")
@@ -1,9 +1,53 @@
 """탭 A: 정량 데이터 — 분석의 대상이 되는 모든 숫자"""
 
+import pandas as pd
 import streamlit as st
+from utils import exhibition_days
+
+# 같은 종류의 개수 입력은 칸마다 number_input을 두는 대신 한 줄짜리 편집 표 하나로 받음
+# 편집 표 키 → ((세션 키, 열 이름), ...)
+COUNT_TABLES = {
+    "edit_visitor_tickets": (
+        ("visitor_general", "일반"), ("visitor_student", "학생"),
+        ("visitor_invitation", "초대권"), ("visitor_artpass", "예술인패스"),
+        ("visitor_discover", "디스커버서울패스"), ("visitor_discount", "기타 할인"),
+    ),
+    "edit_artworks": (
+        ("artwork_painting", "회화"), ("artwork_sculpture", "조각"),
+        ("artwork_photo", "사진"), ("artwork_installation", "설치"),
+        ("artwork_media", "미디어"), ("artwork_other", "기타"),
+    ),
+}
+
+
+def _count_table(table_key):
+    """개수 편집 표 렌더링 — 수정한 값을 세션 키에 되돌려 쓰고 합계 반환"""
+    s = st.session_state
+    columns = COUNT_TABLES[table_key]
+    labels = [label for _, label in columns]
+    table = pd.DataFrame([[s[key] for key, _ in columns]], columns=labels)
+    edited = st.data_editor(
+        table, hide_index=True, num_rows="fixed", use_container_width=True,
+        column_config={label: st.column_config.NumberColumn(label, min_value=0, step=1, format="%d")
+                       for label in labels},
+        key=table_key)
+    row = edited.iloc[0].fillna(0).astype(int)
+    for (key, _), value in zip(columns, row.tolist()):
+        s[key] = value
+    return int(row.sum())
+
+
+def _count_outlets(items):
+    """매체명이 입력된 보도 항목 수 (중간 리스트 없이 셈)"""
+    return sum(1 for item in items if item.get("outlet"))
+
+
+def _set_press_count(count):
+    st.session_state.press_count = count
 
 
 def render(tab):
+    s = st.session_state
     with tab:
         st.markdown('<div class="section-header">📊 정량 데이터</div>', unsafe_allow_html=True)
         st.caption("숫자를 입력하면 다음 탭에서 과거 전시와의 비교 분석이 자동 생성됩니다.")
@@ -22,8 +66,8 @@ def render(tab):
                             key="budget_supplementary", format="%d")
 
         # 총 사용 예산 자동 합산
-        total_budget = st.session_state.budget_exhibition + st.session_state.budget_supplementary
-        st.session_state.total_budget = total_budget
+        total_budget = s.budget_exhibition + s.budget_supplementary
+        s.total_budget = total_budget
         if total_budget > 0:
             st.metric("총 사용 예산", f"{total_budget:,}원")
 
@@ -39,8 +83,8 @@ def render(tab):
                             key="other_revenue", format="%d")
 
         # 총수입 자동 합산
-        total_revenue = st.session_state.ticket_revenue + st.session_state.other_revenue
-        st.session_state.total_revenue = total_revenue
+        total_revenue = s.ticket_revenue + s.other_revenue
+        s.total_revenue = total_revenue
         if total_revenue > 0:
             st.metric("총수입", f"{total_revenue:,}원")
 
@@ -48,16 +92,16 @@ def render(tab):
         if total_budget > 0:
             metrics = st.columns(3)
             with metrics[0]:
-                if st.session_state.budget_exhibition and st.session_state.budget_supplementary:
-                    ratio = st.session_state.budget_exhibition / total_budget * 100
+                if s.budget_exhibition and s.budget_supplementary:
+                    ratio = s.budget_exhibition / total_budget * 100
                     st.metric("전시비 비율", f"{ratio:.1f}%")
             with metrics[1]:
                 if total_revenue:
                     recovery = total_revenue / total_budget * 100
                     st.metric("예산 회수율", f"{recovery:.1f}%")
             with metrics[2]:
-                if st.session_state.budget_planned:
-                    exec_rate = total_budget / st.session_state.budget_planned * 100
+                if s.budget_planned:
+                    exec_rate = total_budget / s.budget_planned * 100
                     st.metric("집행률", f"{exec_rate:.1f}%")
 
         st.divider()
@@ -73,37 +117,19 @@ def render(tab):
                             key="total_visitors", format="%d")
         with col2:
             # 일평균 자동 계산
-            days = None
-            if st.session_state.period_start and st.session_state.period_end:
-                days = (st.session_state.period_end - st.session_state.period_start).days + 1
-            if st.session_state.total_visitors and days and days > 0:
-                daily_avg = st.session_state.total_visitors // days
+            days = exhibition_days()
+            if s.total_visitors and days and days > 0:
+                daily_avg = s.total_visitors // days
                 st.metric("일평균 관객수 (자동)", f"{daily_avg:,}명")
             else:
                 st.caption("일평균 관객수: 전시 기간 입력 시 자동 계산")
 
         st.markdown("**입장권별 관객 구성**")
-        cols = st.columns(6)
-        with cols[0]:
-            st.number_input("일반", min_value=0, key="visitor_general", format="%d")
-        with cols[1]:
-            st.number_input("학생", min_value=0, key="visitor_student", format="%d")
-        with cols[2]:
-            st.number_input("초대권", min_value=0, key="visitor_invitation", format="%d")
-        with cols[3]:
-            st.number_input("예술인패스", min_value=0, key="visitor_artpass", format="%d")
-        with cols[4]:
-            st.number_input("디스커버서울패스", min_value=0, key="visitor_discover", format="%d")
-        with cols[5]:
-            st.number_input("기타 할인", min_value=0, key="visitor_discount", format="%d")
-
         # 합계 자동 검증
-        ticket_sum = (st.session_state.visitor_general + st.session_state.visitor_student +
-                      st.session_state.visitor_invitation + st.session_state.visitor_artpass +
-                      st.session_state.visitor_discover + st.session_state.visitor_discount)
-        if ticket_sum > 0 and st.session_state.total_visitors > 0:
-            if ticket_sum != st.session_state.total_visitors:
-                st.warning(f"⚠️ 입장권별 합계({ticket_sum:,}명)와 총 관객수({st.session_state.total_visitors:,}명)가 다릅니다.")
+        ticket_sum = _count_table("edit_visitor_tickets")
+        if ticket_sum > 0 and s.total_visitors > 0:
+            if ticket_sum != s.total_visitors:
+                st.warning(f"⚠️ 입장권별 합계({ticket_sum:,}명)와 총 관객수({s.total_visitors:,}명)가 다릅니다.")
             else:
                 st.success(f"✅ 입장권별 합계 일치: {ticket_sum:,}명")
 
@@ -120,25 +146,9 @@ def render(tab):
         # ════════════════════════════════════════
         st.subheader("🎨 출품 작품")
 
-        cols = st.columns(6)
-        with cols[0]:
-            st.number_input("회화", min_value=0, key="artwork_painting", format="%d")
-        with cols[1]:
-            st.number_input("조각", min_value=0, key="artwork_sculpture", format="%d")
-        with cols[2]:
-            st.number_input("사진", min_value=0, key="artwork_photo", format="%d")
-        with cols[3]:
-            st.number_input("설치", min_value=0, key="artwork_installation", format="%d")
-        with cols[4]:
-            st.number_input("미디어", min_value=0, key="artwork_media", format="%d")
-        with cols[5]:
-            st.number_input("기타", min_value=0, key="artwork_other", format="%d")
-
         # 출품 작품 수 자동 합산
-        artwork_total = (st.session_state.artwork_painting + st.session_state.artwork_sculpture +
-                         st.session_state.artwork_photo + st.session_state.artwork_installation +
-                         st.session_state.artwork_media + st.session_state.artwork_other)
-        st.session_state.artwork_total = artwork_total
+        artwork_total = _count_table("edit_artworks")
+        s.artwork_total = artwork_total
         if artwork_total > 0:
             st.metric("출품 작품 수 (총)", f"{artwork_total}점")
 
@@ -206,11 +216,10 @@ def render(tab):
             st.number_input("멤버십 회원수", min_value=0, key="membership_count", format="%d")
 
         # ── 보도 건수 자동 동기화 제안 ──
-        print_count = len([p for p in st.session_state.press_print if p.get("outlet")])
-        online_count = len([p for p in st.session_state.press_online if p.get("outlet")])
-        list_total = print_count + online_count
-        if list_total > 0 and st.session_state.press_count == 0:
+        list_total = (_count_outlets(s.press_print)
+                      + _count_outlets(s.press_online))
+        if list_total > 0 and s.press_count == 0:
             st.info(f"💡 '기반 정보' 탭에 보도 {list_total}건이 입력되어 있습니다. 언론 보도 건수를 {list_total}으로 설정하시겠습니까?")
-            if st.button("자동 입력", key="sync_press"):
-                st.session_state.press_count = list_total
-                st.rerun()
+            # 위젯이 이미 만들어진 뒤에는 키에 대입할 수 없으므로 콜백(다음 실행 전)에서 설정
+            st.button("자동 입력", key="sync_press",
+                      on_click=_set_press_count, args=(list_total,))
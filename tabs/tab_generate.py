@@ -1,16 +1,21 @@
 """탭 D: 보고서 미리보기 & 생성"""
 
-import os
 import json
-import tempfile
 import streamlit as st
 from datetime import date
 
-from utils import fmt_money, fmt_number, collect_analysis_data
+from utils import (fmt_money, fmt_number, collect_analysis_data, exhibition_days, parse_artists,
+                   SESSION_DEFAULTS)
 import analysis_engine as ae
-import reference_data as rd
 from llm_writer import rewrite_insights, validate_api_key, estimate_cost, HAS_ANTHROPIC
 
+# 작업 JSON 저장/복원은 orjson이 있으면 사용 (표준 json보다 수 배 빠름)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 
 def render(tab, load_reference_data):
     with tab:
@@ -108,24 +113,33 @@ def _show_preview():
     """보고서 구조의 텍스트 미리보기"""
     s = st.session_state
 
+    # 섹션별 인사이트와 선택/수정 내용은 한 번만 읽어 각 섹션 미리보기에 나눠 줌
+    result = s.get("analysis_result")
+    by_section = ae.get_insights_by_section(result) if result else {}
+    selections = s.get("insight_selections", {})
+    texts = s.get("insight_texts", {})
+
+    def show_insights(section):
+        section_insights = by_section.get(section)
+        if section_insights:  # 분석 전이거나 이 섹션에 인사이트가 없으면 건너뜀
+            _show_section_insights(section, section_insights, selections, texts)
+
     # 제목
     title = s.exhibition_title or "(전시 제목)"
-    st.markdown(f"### 전시보고서 - 《{title}》")
-    st.markdown("---")
+    st.markdown(f"### 전시보고서 - 《{title}》\n\n---")
 
     # I. 전시 개요
     with st.expander("**I. 전시 개요**", expanded=False):
         period = ""
-        if s.period_start and s.period_end:
-            days = (s.period_end - s.period_start).days + 1
+        days = exhibition_days()
+        if days is not None:
             period = f"{s.period_start.strftime('%Y.%m.%d')} - {s.period_end.strftime('%Y.%m.%d')} ({days}일)"
-        st.markdown(f"- 전시 제목: 《{title}》")
-        st.markdown(f"- 전시 기간: {period}")
-        st.markdown(f"- 참여 작가: {s.artists}")
+        lines = [f"- 전시 제목: 《{title}》", f"- 전시 기간: {period}", f"- 참여 작가: {s.artists}"]
         if s.total_budget:
-            st.markdown(f"- 총 사용 예산: **{fmt_money(s.total_budget)}**")
+            lines.append(f"- 총 사용 예산: **{fmt_money(s.total_budget)}**")
         if s.total_visitors:
-            st.markdown(f"- 관객 수: **{fmt_number(s.total_visitors, '명')}**")
+            lines.append(f"- 관객 수: **{fmt_number(s.total_visitors, '명')}**")
+        _show_lines(lines)
 
     # II. 전시 주제와 내용
     with st.expander("**II. 전시 주제와 내용**", expanded=False):
@@ -136,90 +150,88 @@ def _show_preview():
 
     # III. 전시 구성 + 인라인 분석
     with st.expander("**III. 전시 구성**", expanded=False):
-        st.markdown(f"- 전시실: {len(s.rooms)}개")
+        lines = [f"- 전시실: {len(s.rooms)}개"]
         if s.program_count:
-            st.markdown(f"- 프로그램: {s.program_count}개, {s.program_participants}명 참여")
+            lines.append(f"- 프로그램: {s.program_count}개, {s.program_participants}명 참여")
         if s.artwork_total:
-            st.markdown(f"- 출품 작품: {s.artwork_total}점")
-        _show_section_insights("composition")
+            lines.append(f"- 출품 작품: {s.artwork_total}점")
+        _show_lines(lines)
+        show_insights(ae.Section.composition)
 
     # IV. 전시 결과 + 인라인 분석
     with st.expander("**IV. 전시 결과**", expanded=True):
+        lines = []
         if s.total_budget:
-            st.markdown(f"- 총 사용 예산: {fmt_money(s.total_budget)}")
+            lines.append(f"- 총 사용 예산: {fmt_money(s.total_budget)}")
         if s.total_revenue:
-            st.markdown(f"- 총수입: {fmt_money(s.total_revenue)}")
+            lines.append(f"- 총수입: {fmt_money(s.total_revenue)}")
         if s.total_visitors:
-            st.markdown(f"- 총 관객수: {fmt_number(s.total_visitors, '명')}")
-        _show_section_insights("results")
+            lines.append(f"- 총 관객수: {fmt_number(s.total_visitors, '명')}")
+        _show_lines(lines)
+        show_insights(ae.Section.results)
 
     # V. 홍보 + 인라인 분석
     with st.expander("**V. 홍보 방식 및 언론 보도**", expanded=False):
+        lines = []
         if s.press_count:
-            st.markdown(f"- 언론 보도: {s.press_count}건")
+            lines.append(f"- 언론 보도: {s.press_count}건")
         if s.sns_posts:
-            st.markdown(f"- SNS 게시: {s.sns_posts}건")
-        _show_section_insights("promotion")
+            lines.append(f"- SNS 게시: {s.sns_posts}건")
+        _show_lines(lines)
+        show_insights(ae.Section.promotion)
 
     # VI. 평가 + 교차 분석 + 평가 초안
     with st.expander("**VI. 평가 및 개선 방안**", expanded=True):
-        _show_section_insights("evaluation")
+        show_insights(ae.Section.evaluation)
 
-        st.markdown("**긍정 평가:**")
-        _show_eval_items("positive")
-        st.markdown("**부정 평가:**")
-        _show_eval_items("negative")
-        st.markdown("**개선 방안:**")
-        _show_eval_items("improvement")
+        _show_eval_items("positive", "긍정 평가")
+        _show_eval_items("negative", "부정 평가")
+        _show_eval_items("improvement", "개선 방안")
 
 
-def _show_section_insights(section):
-    """특정 보고서 섹션에 배치될 인사이트 미리보기"""
-    result = st.session_state.get("analysis_result")
-    if not result:
-        return
+def _show_lines(lines):
+    """미리보기 항목 줄을 마크다운 요소 하나로 출력 (줄마다 요소를 만들지 않음)"""
+    if lines:
+        st.markdown("\n".join(lines))
 
-    by_section = ae.get_insights_by_section(result)
-    section_insights = by_section.get(section, [])
 
+def _show_section_insights(section, section_insights, selections, texts):
+    """특정 보고서 섹션에 배치될 인사이트 미리보기"""
     selected = []
     for i, ins in enumerate(section_insights):
         key = f"ins_{section}_{i}"
-        if st.session_state.get("insight_selections", {}).get(key, ins.priority <= 2):
-            text = st.session_state.get("insight_texts", {}).get(key, ins.text)
-            selected.append((ins, text))
+        if selections.get(key, ins.priority <= 2):
+            selected.append((ins, texts.get(key, ins.text)))
 
     if selected:
         st.markdown("---")
         st.caption("📊 데이터 기반 분석:")
-        for ins, text in selected:
-            icon = ae.CATEGORY_ICONS.get(ins.category, "")
-            st.markdown(f"> {icon} {text}")
+        # 빈 줄로 구분하면 인용문이 하나로 합쳐지지 않고 항목마다 따로 표시됨
+        icons = ae.CATEGORY_ICONS
+        st.markdown("\n\n".join(f"> {icons[ins.category]} {text}" for ins, text in selected))
 
 
-def _show_eval_items(eval_type):
-    """평가 항목 미리보기 (자동 초안 + 사용자 추가분)"""
+def _show_eval_items(eval_type, heading):
+    """평가 항목 미리보기 (자동 초안 + 사용자 추가분) — 제목과 항목을 마크다운 요소 하나로"""
     drafts_key = f"eval_{eval_type}_drafts"
     custom_key = f"eval_{eval_type}_custom"
 
     drafts = st.session_state.get(drafts_key, [])
-    for d in drafts:
-        if d.selected:
-            st.markdown(f"- {d.text}")
-
     customs = st.session_state.get(custom_key, [])
-    for c in customs:
-        if c.strip():
-            st.markdown(f"- {c}")
+    lines = ([f"- {d.text}" for d in drafts if d.selected]
+             + [f"- {c}" for c in customs if c.strip()])
 
-    if not any(d.selected for d in drafts) and not any(c.strip() for c in customs):
+    if lines:
+        _show_lines([f"**{heading}:**"] + lines)
+    else:
+        st.markdown(f"**{heading}:**")
         st.caption("(항목 없음)")
 
 
 def _generate_report(api_key=None):
     """Word 보고서 생성 — LLM 글쓰기 통합"""
     try:
-        from report_generator import generate_report
+        from report_generator import generate_report_bytes
 
         data = _collect_report_data()
         s = st.session_state
@@ -267,16 +279,15 @@ def _generate_report(api_key=None):
                 data["llm_sections"] = llm_result.sections
 
         # ── Word 보고서 생성 ──
-        output_path = os.path.join(tempfile.gettempdir(), "exhibition_report_v3.docx")
-        generate_report(data, output_path)
-
-        with open(output_path, "rb") as f:
-            st.download_button(
-                "📥 보고서 다운로드",
-                f.read(),
-                file_name=f"전시보고서_{s.exhibition_title or 'v3'}.docx",
-                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            )
+        # 임시 파일에 저장했다가 다시 읽지 않고 메모리에서 바로 다운로드 버튼에 전달
+        report_bytes = generate_report_bytes(data)
+
+        st.download_button(
+            "📥 보고서 다운로드",
+            report_bytes,
+            file_name=f"전시보고서_{s.exhibition_title or 'v3'}.docx",
+            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        )
         st.success("✅ 보고서가 생성되었습니다!")
 
     except Exception as e:
@@ -285,47 +296,49 @@ def _generate_report(api_key=None):
         st.code(traceback.format_exc())
 
 
+# 보고서 입장권별 관객 표: (라벨, 세션 키)
+_TICKET_FIELDS = (("일반", "visitor_general"), ("학생", "visitor_student"),
+                  ("초대권", "visitor_invitation"), ("예술인패스", "visitor_artpass"),
+                  ("기타 할인", "visitor_discount"))
+
+
 def _collect_report_data():
     """전체 데이터를 report_generator에 맞는 구조로 수집"""
     s = st.session_state
 
     # 전시 기간
     period = ""
-    days = 0
-    if s.period_start and s.period_end:
-        days = (s.period_end - s.period_start).days + 1
+    days = exhibition_days()
+    if days is None:
+        days = 0
+    else:
         period = f"{s.period_start.strftime('%Y.%m.%d')} - {s.period_end.strftime('%Y.%m.%d')} ({days}일간)"
 
-    artists = [a.strip() for a in s.artists.split(",") if a.strip()]
+    artists = list(parse_artists(s.artists))
 
     # 선택된 인사이트 수집 (섹션별)
     selected_insights = {}
     result = s.get("analysis_result")
     if result:
-        by_section = ae.get_insights_by_section(result)
-        for section_key, section_insights in by_section.items():
-            items = []
-            for i, ins in enumerate(section_insights):
-                key = f"ins_{section_key}_{i}"
-                if s.get("insight_selections", {}).get(key, ins.priority <= 2):
-                    text = s.get("insight_texts", {}).get(key, ins.text)
-                    items.append({
-                        "category": ins.category,
-                        "category_label": ae.CATEGORY_LABELS.get(ins.category, ins.category),
-                        "text": text,
-                    })
-            selected_insights[section_key] = items
+        selections = s.get("insight_selections", {})
+        texts = s.get("insight_texts", {})
+        labels = ae.CATEGORY_LABELS
+        for section_key, section_insights in ae.get_insights_by_section(result).items():
+            keys = [f"ins_{section_key}_{i}" for i in range(len(section_insights))]
+            selected_insights[section_key.name] = [
+                {
+                    "category": ins.category.name,
+                    "category_label": labels[ins.category],
+                    "text": texts.get(key, ins.text),
+                }
+                for key, ins in zip(keys, section_insights)
+                if selections.get(key, ins.priority <= 2)
+            ]
 
     # 평가 수집
     def collect_eval(drafts_key, custom_key):
-        items = []
-        for d in s.get(drafts_key, []):
-            if d.selected:
-                items.append(d.text)
-        for c in s.get(custom_key, []):
-            if c.strip():
-                items.append(c)
-        return items
+        return ([d.text for d in s.get(drafts_key, []) if d.selected]
+                + [c for c in s.get(custom_key, []) if c.strip()])
 
     # 유사 전시 비교표
     sim_headers = None
@@ -333,7 +346,8 @@ def _collect_report_data():
     if result and result.similar_comparison_table is not None:
         df = result.similar_comparison_table
         sim_headers = list(df.columns)
-        sim_data = df.values.tolist()
+        # 열 타입이 섞인 표를 object ndarray로 한 번 더 복사하지 않고 행 단위로 바로 꺼냄
+        sim_data = [list(row) for row in df.itertuples(index=False, name=None)]
 
     data = {
         "exhibition_title": s.exhibition_title,
@@ -378,7 +392,8 @@ def _collect_report_data():
             "ticket_revenue": fmt_money(s.ticket_revenue),
         },
         "visitor_composition": {
-            "ticket_type": {},
+            # 입장권별 관객 (0명인 항목 제외)
+            "ticket_type": {label: s[key] for label, key in _TICKET_FIELDS if s[key] > 0},
             "ticket_analysis": [t for t in s.visitor_ticket_analysis if t.strip()],
             "visitor_type": {},
             "weekly_visitors": s.weekly_visitors,
@@ -421,13 +436,6 @@ def _collect_report_data():
         "similar_comparison_table": sim_data,
     }
 
-    # 입장권별 관객
-    if s.visitor_general > 0: data["visitor_composition"]["ticket_type"]["일반"] = s.visitor_general
-    if s.visitor_student > 0: data["visitor_composition"]["ticket_type"]["학생"] = s.visitor_student
-    if s.visitor_invitation > 0: data["visitor_composition"]["ticket_type"]["초대권"] = s.visitor_invitation
-    if s.visitor_artpass > 0: data["visitor_composition"]["ticket_type"]["예술인패스"] = s.visitor_artpass
-    if s.visitor_discount > 0: data["visitor_composition"]["ticket_type"]["기타 할인"] = s.visitor_discount
-
     return data
 
 
@@ -442,18 +450,20 @@ def _convert_dates(obj):
     return obj
 
 
+# JSON으로 저장하는 세션 키 — 기본값이 있는 입력 키 중 분석 결과(다시 생성 가능)를 뺀 것.
+# 위젯 키(목록·편집 표·체크박스 등)는 여기에 없으므로 저장되지 않음
+_UNSAVED_KEYS = {"analysis_result", "insight_selections", "insight_texts",
+                 "eval_positive_drafts", "eval_negative_drafts", "eval_improvement_drafts"}
+SAVEABLE_KEYS = tuple(key for key in SESSION_DEFAULTS if key not in _UNSAVED_KEYS)
+
+
 def _save_json():
     """현재 데이터를 JSON으로 저장"""
     s = st.session_state
     save_data = {}
-    skip_keys = {"analysis_result", "insight_selections", "insight_texts",
-                 "eval_positive_drafts", "eval_negative_drafts", "eval_improvement_drafts",
-                 "json_upload", "type_select"}
 
-    for key in s:
-        if key.startswith(("chk_", "txt_", "echk_", "etxt_", "custom_")):
-            continue
-        if key in skip_keys:
+    for key in SAVEABLE_KEYS:
+        if key not in s:
             continue
         val = s[key]
         if isinstance(val, date):
@@ -463,7 +473,12 @@ def _save_json():
         elif isinstance(val, (str, int, float, bool)):
             save_data[key] = val
 
-    json_str = json.dumps(save_data, ensure_ascii=False, indent=2)
+    # 들여쓰기 없이 압축 형식으로 직렬화 (orjson은 bytes를 바로 만들어 다운로드 버튼에 넘김)
+    if HAS_ORJSON:
+        json_str = orjson.dumps(save_data, default=str,
+                                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        json_str = json.dumps(save_data, ensure_ascii=False, separators=(",", ":"), default=str)
     st.download_button(
         "💾 JSON 다운로드",
         json_str,
@@ -475,7 +490,14 @@ def _save_json():
 def _load_json(uploaded):
     """JSON에서 데이터 복원 — pending 패턴으로 위젯 충돌 회피"""
     try:
-        data = json.loads(uploaded.read())
+        raw = uploaded.read()
+        try:
+            data = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+        except ValueError:
+            # 표준 json으로 저장된 NaN/Infinity 등은 orjson이 거부하므로 한 번 더 시도
+            data = json.loads(raw)
+        # 저장 대상 키만 남김 — 이전 버전이 저장한 위젯 키(버튼 등)는 session_state에 넣을 수 없음
+        data = {key: data[key] for key in SAVEABLE_KEYS if key in data}
         # 위젯이 이미 렌더링된 상태이므로 직접 대입 불가.
         # _pending_json에 저장 후 rerun → app.py의 init_session에서 적용
         st.session_state["_pending_json"] = data
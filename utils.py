@@ -1,9 +1,129 @@
 """v3 공통 헬퍼"""
 
 import os
+import shutil
 import tempfile
+import time
 import streamlit as st
 from datetime import date
+from functools import lru_cache
+
+
+# 부분 재실행 데코레이터: 해당 함수 안의 위젯이 바뀌면 그 부분만 다시 실행
+# (st.fragment는 1.37+, 1.33~1.36은 experimental_fragment, 그 이전 버전은 일반 함수로 동작)
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+
+# 세션 상태 기본값 (app.init_session이 없는 키만 복사해 채움, JSON 저장 대상의 기준)
+SESSION_DEFAULTS = {
+    # ── B: 기반 정보 ──
+    "exhibition_title": "",
+    "period_start": None,
+    "period_end": None,
+    "artists": "",
+    "chief_curator": "",
+    "curators": "",
+    "coordinators": "",
+    "curatorial_team": "",
+    "pr_person": "",
+    "sponsors": "",
+    "theme_text": "",
+    "rooms": [{"name": "1전시실", "artists": ""}],
+    "related_programs": [{"category": None, "title": "", "date": None, "participants": "", "note": ""}],
+    "printed_materials": [{"type": None, "quantity": "", "note": ""}],
+    # 홍보 방식 (B — 서술)
+    "promo_advertising": "",
+    "promo_press_release": "",
+    "promo_web_invitation": "",
+    "promo_newsletter": "",
+    "promo_sns": "",
+    "promo_other": "",
+    # 언론보도 리스트 (B — 서술)
+    "press_print": [{"outlet": "", "date": None, "title": "", "note": ""}],
+    "press_online": [{"outlet": "", "date": None, "title": "", "url": ""}],
+    "membership_text": "",
+    # 관객 후기 (B — 정성)
+    "visitor_reviews": [{"category": "긍정", "content": "", "source": ""}],
+
+    # ── A: 정량 데이터 ──
+    "total_budget": 0,
+    "budget_exhibition": 0,
+    "budget_supplementary": 0,
+    "budget_planned": 0,
+    "total_revenue": 0,
+    "ticket_revenue": 0,
+    "other_revenue": 0,
+    "total_visitors": 0,
+    "visitor_general": 0,
+    "visitor_student": 0,
+    "visitor_invitation": 0,
+    "visitor_artpass": 0,
+    "visitor_discover": 0,
+    "visitor_discount": 0,
+    "visitor_group": 0,
+    "opening_attendance": 0,
+    "artwork_total": 0,
+    "artwork_painting": 0,
+    "artwork_sculpture": 0,
+    "artwork_photo": 0,
+    "artwork_installation": 0,
+    "artwork_media": 0,
+    "artwork_other": 0,
+    "program_count": 0,
+    "program_sessions": 0,
+    "program_participants": 0,
+    "docent_total": 0,
+    "docent_regular": 0,
+    "docent_special": 0,
+    "staff_total": 0,
+    "staff_paid": 0,
+    "staff_volunteer": 0,
+    "press_count": 0,
+    "sns_posts": 0,
+    "sns_feedback": 0,
+    "web_invitation_count": 0,
+    "newsletter_open_rate": 0.0,
+    "membership_count": 0,
+
+    # ── 분석 설정 ──
+    "exhibition_type": None,
+
+    # ── C: 분석 결과 ──
+    "analysis_result": None,
+    "insight_selections": {},
+    "insight_texts": {},
+    "eval_positive_drafts": [],
+    "eval_negative_drafts": [],
+    "eval_improvement_drafts": [],
+    # 사용자 추가 평가
+    "eval_positive_custom": [""],
+    "eval_negative_custom": [""],
+    "eval_improvement_custom": [""],
+
+    # ── 예산 상세 (보고서용) ──
+    "budget_summary": [{"category": "", "planned": "", "actual": "", "note": ""}],
+    "budget_details": [{"category": "", "subcategory": "", "detail": "", "amount": "", "note": ""}],
+    "budget_breakdown_notes": [""],
+    "budget_arrow_notes": [""],
+    # 관객 분석 텍스트
+    "visitor_ticket_analysis": [""],
+    "visitor_analysis_text": "",
+    "weekly_visitors": {},
+}
+
+
+def exhibition_days():
+    """전시 일수 (시작일·종료일 포함) — 기간이 입력되지 않았으면 None"""
+    s = st.session_state
+    if s.period_start and s.period_end:
+        return (s.period_end - s.period_start).days + 1
+    return None
+
+
+@lru_cache(maxsize=32)
+def parse_artists(raw):
+    """쉼표로 구분한 참여 작가 문자열 → 이름 튜플 (같은 문자열은 한 번만 나눔)"""
+    return tuple(a.strip() for a in raw.split(",") if a.strip())
 
 
 def add_item(key, template):
@@ -15,21 +135,31 @@ def remove_item(key, index):
         st.session_state[key].pop(index)
 
 
+# parse_num에서 지우는 단위·구분 문자 (한 번의 translate로 처리)
+_NUM_STRIP = str.maketrans("", "", ",명원%개회")
+
+
 def parse_num(s):
     """범용 숫자 파싱"""
     if s is None:
         return None
     if isinstance(s, (int, float)):
         return float(s) if s != 0 else None
-    s = str(s).replace(",", "").replace("명", "").replace("원", "")
-    s = s.replace("%", "").replace("약 ", "").replace("개", "").replace("회", "").strip()
+    # 순수 숫자 문자열은 문자 치환 없이 바로 변환
+    s = str(s)
     try:
         v = float(s)
-        return v if v != 0 else None
-    except (ValueError, TypeError):
-        return None
+    except ValueError:
+        s = s.translate(_NUM_STRIP).replace("약 ", "").strip()
+        try:
+            v = float(s)
+        except ValueError:
+            return None
+    return v if v != 0 else None
 
 
+# 같은 금액·인원이 미리보기와 보고서 여러 곳에 반복 표시되므로 결과를 캐시
+@lru_cache(maxsize=4096)
 def fmt_number(v, unit=""):
     """숫자를 한국어 포맷으로"""
     if v is None or v == 0:
@@ -38,14 +168,14 @@ def fmt_number(v, unit=""):
     return f"{v:,}{unit}"
 
 
+@lru_cache(maxsize=4096)
 def fmt_money(v):
     """금액 포맷"""
     if v is None or v == 0:
         return ""
     v = int(v)
     if v >= 100_000_000:
-        eok = v // 100_000_000
-        remainder = v % 100_000_000
+        eok, remainder = divmod(v, 100_000_000)
         if remainder >= 10_000_000:
             man = remainder // 10_000
             return f"약 {eok}억 {man:,}만 원({v:,}원)"
@@ -61,28 +191,88 @@ def save_uploaded_images_to_temp(uploaded_files, prefix="img"):
     if uploaded_files:
         for i, f in enumerate(uploaded_files):
             path = os.path.join(tempfile.gettempdir(), f"{prefix}_{i}.png")
+            # getvalue()로 전체 복사본을 만들지 않고 1 MiB 단위로 바로 씀
+            f.seek(0)
             with open(path, "wb") as out:
-                out.write(f.getvalue())
+                shutil.copyfileobj(f, out, length=1024 * 1024)
             paths.append(path)
     return paths
 
 
+# 세션별 업로드 디렉터리를 모아 두는 곳과, 손대지 않은 세션 디렉터리를 지우기까지의 시간(초)
+UPLOAD_ROOT = os.path.join(tempfile.gettempdir(), "exhibition_uploads")
+UPLOAD_TTL = 24 * 60 * 60
+
+
+def _sweep_stale_uploads():
+    """UPLOAD_TTL 동안 쓰이지 않은(종료·방치된 세션의) 업로드 디렉터리 삭제"""
+    cutoff = time.time() - UPLOAD_TTL
+    try:
+        with os.scandir(UPLOAD_ROOT) as it:
+            stale = [e.path for e in it if e.is_dir() and e.stat().st_mtime < cutoff]
+    except OSError:
+        return
+    for path in stale:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def upload_dir():
+    """세션별 업로드 임시 디렉터리 (처음 호출할 때 만들면서 오래된 세션 디렉터리를 정리)"""
+    s = st.session_state
+    path = s.get("_upload_dir")
+    if not path or not os.path.isdir(path):
+        os.makedirs(UPLOAD_ROOT, exist_ok=True)
+        _sweep_stale_uploads()
+        path = tempfile.mkdtemp(prefix="session_", dir=UPLOAD_ROOT)
+        s["_upload_dir"] = path
+    return path
+
+
+def discard_uploads(paths):
+    """이 세션 업로드 디렉터리에 있는 파일만 삭제 (JSON으로 불러온 외부 경로는 건드리지 않음)"""
+    session_dir = st.session_state.get("_upload_dir")
+    if not session_dir:
+        return
+    for path in paths:
+        if path and os.path.dirname(path) == session_dir:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def save_upload_streamed(uploaded, prefix="upload"):
+    """업로드 파일을 1 MiB 단위로 세션 임시 디렉터리에 복사하고 경로 반환
+
+    파일 이름에 업로드 ID를 넣어, 재실행마다 같은 파일을 다시 쓰지 않음.
+    """
+    if uploaded is None:
+        return None
+    ext = os.path.splitext(uploaded.name)[1].lower()
+    directory = upload_dir()
+    path = os.path.join(directory, f"{prefix}_{uploaded.file_id}{ext}")
+    if os.path.exists(path):
+        os.utime(directory)  # 쓰고 있는 세션 디렉터리는 정리 대상에서 빠지도록 갱신
+    else:
+        uploaded.seek(0)
+        with open(path, "wb") as out:
+            shutil.copyfileobj(uploaded, out, length=1024 * 1024)
+    return path
+
+
 def collect_analysis_data() -> dict:
     """세션 상태에서 분석용 flat dict 생성 (레퍼런스 컬럼명 기준)"""
     s = st.session_state
 
     # 전시 일수 자동 계산
-    exhibition_days = None
-    if s.period_start and s.period_end:
-        delta = s.period_end - s.period_start
-        exhibition_days = delta.days + 1
+    days = exhibition_days()
 
     # 참여 작가 수
-    artist_count = len([a.strip() for a in s.artists.split(",") if a.strip()]) if s.artists else None
+    artist_count = len(parse_artists(s.artists)) if s.artists else None
 
     return {
         "전시 제목": s.exhibition_title,
-        "전시 일수": exhibition_days,
+        "전시 일수": days,
         "참여 작가 수_총(팀)": artist_count,
         "총 사용 예산": (s.budget_exhibition + s.budget_supplementary) or None,
         "전시 사용 예산": s.budget_exhibition or None,
@@ -91,7 +281,7 @@ def collect_analysis_data() -> dict:
         "총수입": (s.ticket_revenue + s.get("other_revenue", 0)) or None,
         "입장 수입": s.ticket_revenue or None,
         "총 관객수": s.total_visitors or None,
-        "일평균 관객수": (s.total_visitors // exhibition_days) if (s.total_visitors and exhibition_days and exhibition_days > 0) else None,
+        "일평균 관객수": (s.total_visitors // days) if (s.total_visitors and days and days > 0) else None,
         "유료 관객수": (s.visitor_general + s.visitor_student) or None,
         "무료/초대 관객수": s.visitor_invitation or None,
         "학생 관객수(만 24세 이하)": s.visitor_student or None,